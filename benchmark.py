@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+
+import sys
+import timeit
+from typing import Callable
+
+def fail(errstr: str|None = None):
+    if errstr is not None:
+        print(errstr, file=sys.stderr)
+    print(f"Usage: {sys.argv[0]} [BENCHMARK...]", file=sys.stderr)
+    print(f"Benchmarks: {', '.join(_BENCHMARKS)}", file=sys.stderr)
+    sys.exit(errstr is not None)
+
+def measure(title: str, func: Callable, *, unit: str = 'op', count: int = 1,
+        duration: float = 1.0) -> float:
+    """Run `func` repeatedly for about `duration` seconds, and print the rate
+
+    Parameters
+    ----------
+    title : str
+        Name of the measurement shown in the output
+    func : function like
+        Function without arguments to be measured
+    unit : str, default='op'
+        Name of the unit processed by a single call of `func`
+    count : int, default=1
+        Number of units processed by a single call of `func`
+    duration : float, default=1.0
+        Approximate measurement time in seconds
+
+    Returns
+    -------
+    float
+        Processed units per second
+    """
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * duration / elapsed))
+    elapsed = min(timer.repeat(3, number))
+    rate = number * count / elapsed
+    print(f"{title:<40} {rate:>14,.1f} {unit}/s")
+    return rate
+
+def bench_aes() -> None:
+    from crypto.cipher import aes, aes_ttable
+    block = bytes(range(16))
+    for bits in (128, 256):
+        key = bytes(range(bits >> 3))
+        rates = []
+        for engine in (aes, aes_ttable):
+            cipher = engine(key)
+            rates.append(measure(f'{engine.__name__}-{bits} encrypt',
+                lambda: cipher.encrypt(block), unit='block'))
+            measure(f'{engine.__name__}-{bits} decrypt',
+                lambda: cipher.decrypt(block), unit='block')
+        print(f"{'speedup':<40} {rates[1] / rates[0]:>14.1f} x")
+
+def bench_gcm() -> None:
+    from crypto import GCM
+    from crypto.cipher import aes, aes_ttable
+    key = bytes(range(16))
+    nonce = bytes(12)
+    record = bytes(16384)
+    for engine in (aes, aes_ttable):
+        gcm = GCM(engine(key))
+        measure(f'GCM({engine.__name__}) keystream 16 KiB',
+            lambda: gcm.gctr(2, record), unit='record',
+            duration=0.2 if engine is aes else 1.0)
+        measure(f'GCM({engine.__name__}) encrypt 16 KiB',
+            lambda: gcm.encrypt(record, b'', nonce), unit='record',
+            duration=0.2 if engine is aes else 1.0)
+
+def bench_ghash() -> None:
+    from crypto import GCM
+    from crypto.cipher import aes_ttable
+    gcm_engine = aes_ttable(bytes(range(16)))
+    record = bytes(16384)
+    for table_bits in (None, 4, 8):
+        gcm = GCM(gcm_engine, table_bits=table_bits)
+        measure(f'GHASH 16 KiB, table bits: {table_bits}',
+            lambda: gcm.ghash(record), unit='record')
+
+def bench_aead() -> None:
+    from crypto import AES_GCM, GCM
+    from crypto.cipher import aes_ttable
+    key = bytes(range(16))
+    nonce = bytes(12)
+    aead = AES_GCM()
+    aead.set_my_key(key)
+    aead.set_my_nonce(nonce)
+    for size in (32, 256, 1024):
+        record = bytes(size)
+        measure(f'GCM setup per record, {size} bytes',
+            lambda: GCM(aes_ttable(key)).encrypt(record, b'', nonce),
+            unit='record')
+        measure(f'AES_GCM (cached keys), {size} bytes',
+            lambda: aead.encrypt(record, b''), unit='record')
+
+def bench_poly() -> None:
+    from crypto.polynomial import Polynomial
+    for q, reverse, methods in (
+            ([8, 4, 3, 1, 0], False, ('bitwise', 'window', 'log')),
+            ([128, 7, 2, 1, 0], True, ('bitwise', 'window'))):
+        for method in methods:
+            _P = Polynomial(q, reverse=reverse, method=method)
+            a = _P(_P.mask - 3 >> 1)
+            b = _P(_P.mask - 5 >> 2)
+            measure(f'GF(2^{max(q)}) {method} mul', lambda: a * b, unit='mul')
+            measure(f'GF(2^{max(q)}) {method} inverse', lambda: a.inverse(),
+                unit='inv', duration=0.2)
+
+def bench_sha() -> None:
+    from crypto.hash import Registry
+    record = bytes(16384)
+    for name in ('sha256', 'sha512'):
+        for variant in (name, f'{name}_unrolled'):
+            func = Registry.get(variant)
+            measure(f'{variant} 16 KiB', lambda: func(record).digest(),
+                unit='record', duration=0.5)
+
+def bench_ecdh() -> None:
+    from crypto.ecdh import ECDH
+    from crypto.groupinfo import GROUP_INFO_BY_STR
+    for group in ('x25519', 'x448', 'secp256r1', 'secp384r1', 'secp521r1'):
+        ecdh = ECDH(GROUP_INFO_BY_STR[group])
+        priv, pub = ecdh.generate_key_pair()
+        measure(f'{group} key pair', lambda: ecdh.generate_key_pair(),
+            unit='key', duration=0.5)
+        measure(f'{group} shared secret', lambda: ecdh.create_secret(priv, pub),
+            unit='secret', duration=0.5)
+
+def bench_modular() -> None:
+    from crypto import ec
+    from crypto.ffdh import FFDH
+    from crypto.modular import Modular
+    from crypto.groupinfo import GROUP_INFO_BY_STR
+    p256 = GROUP_INFO_BY_STR['secp256r1']
+    p = p256.p
+    measure('Modular(p) class creation', lambda: Modular.__wrapped__(p),
+        unit='class')
+    measure('Modular(p) cached', lambda: Modular(p), unit='class')
+    M = Modular(p)
+    a = M(p256.Gx)
+    b = M(p256.Gy)
+    measure('P-256 field mul (new element)', lambda: a * b, unit='mul')
+    def imul():
+        nonlocal a
+        a *= b
+    measure('P-256 field mul (in place)', imul, unit='mul')
+    curve = ec.Weierstrass(a=p256.a, b=p256.b, p=p)
+    G = curve(p256.Gx, p256.Gy)
+    measure('P-256 affine point add', lambda: G + G, unit='add')
+    measure('P-256 affine scalar mul', lambda: (1 << 255 | 12345) * G,
+        unit='mul', duration=0.5)
+    ffdh = FFDH(GROUP_INFO_BY_STR['ffdhe2048'])
+    measure('ffdhe2048 key pair', lambda: ffdh.generate_key_pair(),
+        unit='key', duration=0.5)
+
+_BENCHMARKS: dict[str, Callable] = {
+    'aes': bench_aes,
+    'gcm': bench_gcm,
+    'ghash': bench_ghash,
+    'aead': bench_aead,
+    'poly': bench_poly,
+    'sha': bench_sha,
+    'ecdh': bench_ecdh,
+    'modular': bench_modular,
+    }
+
+def main():
+    names = sys.argv[1:] or list(_BENCHMARKS)
+    if names[0] in ('-h', '--help'):
+        fail()
+    for name in names:
+        if name not in _BENCHMARKS:
+            fail(f"Unknown benchmark '{name}'")
+    for name in names:
+        print(f"==== {name} ====")
+        _BENCHMARKS[name]()
+
+main()
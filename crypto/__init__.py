@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 
 from .encryption import Encryption, NoEncryption
-from .gcm import GCM
+from .gcm import GCM, GCMStream
 from .aesgcm import AES_GCM
 from .hkdf import HKDF
 from .cryptosuite import CryptoSuite
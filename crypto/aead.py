@@ -43,3 +43,18 @@ class AEAD:
         plain_text, auth_tag = self.decrypt_message(cipher_text, auth_data, nonce)
         self.peer_rec_seq_num += 1
         return plain_text, auth_tag
+
+    def decrypt_and_verify(self, cipher_text: bytes, auth_data: bytes, auth_tag: bytes) -> bytes:
+        """Decrypt a record, if its authentication tag is valid
+
+        The record sequence number is only increased for valid records.
+
+        Raises
+        ------
+        ValueError
+            Authentication tag does not match
+        """
+        nonce = (self.peer_nonce ^ self.peer_rec_seq_num).to_bytes(12, 'big')
+        plain_text = self.decrypt_and_verify_message(cipher_text, auth_data, nonce, auth_tag)
+        self.peer_rec_seq_num += 1
+        return plain_text
@@ -1,14 +1,34 @@
 #!/usr/bin/python3
 
+from typing import Callable
 from .aead import AEAD
-from .cipher.aes import aes
+from .cipher.aes_ttable import aes_ttable
 from .gcm import GCM
 
 class AES_GCM(AEAD):
+    """AES-GCM AEAD
+
+    Key expansion, the hash key and its GHASH tables are calculated once per
+    traffic key, when the key is set. A record only costs the bulk crypto.
+    """
+    block_cipher: Callable = aes_ttable
+    my_gcm: GCM
+    peer_gcm: GCM
+
+    def set_my_key(self, key: bytes) -> None:
+        super().set_my_key(key)
+        self.my_gcm = GCM(self.block_cipher(key))
+
+    def set_peer_key(self, key: bytes) -> None:
+        super().set_peer_key(key)
+        self.peer_gcm = GCM(self.block_cipher(key))
+
     def encrypt_message(self, plain_text: bytes, auth_data: bytes, nonce: bytes) -> (bytes, bytes):
-        gcm = GCM(aes(self.my_key))
-        return gcm.encrypt(plain_text, auth_data, nonce)
+        return self.my_gcm.encrypt(plain_text, auth_data, nonce)
 
     def decrypt_message(self, cipher_text: bytes, auth_data: bytes, nonce: bytes) -> (bytes, bytes):
-        gcm = GCM(aes(self.peer_key))
-        return gcm.decrypt(cipher_text, auth_data, nonce)
+        return self.peer_gcm.decrypt(cipher_text, auth_data, nonce)
+
+    def decrypt_and_verify_message(self, cipher_text: bytes, auth_data: bytes,
+            nonce: bytes, auth_tag: bytes) -> bytes:
+        return self.peer_gcm.decrypt_and_verify(cipher_text, auth_data, nonce, auth_tag)
@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 
 from .aes import aes
+from .aes_ttable import aes_ttable
 
 from .registry import Registry
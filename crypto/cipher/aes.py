@@ -45,7 +45,7 @@ class aes(BlockCipher):
         return _state_to_raw(state)
 
 
-_GF256 = Polynomial([8, 4, 3, 1, 0])
+_GF256 = Polynomial([8, 4, 3, 1, 0], method='log')
 
 def _raw_to_state(raw: bytes) -> State:
 #>    return [list(t) for t in zip(*zip(*[iter(raw)]*4))]
@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+# NIST FIPS 197, 5.2.1 (implementation suggestions for 32-bit processors)
+# Also: J. Daemen, V. Rijmen: The Design of Rijndael, 4.2
+
+import struct
+from .aes import _SBOX, _INVSBOX, _key_expansion
+from .blockcipher import BlockCipher
+from .registry import Registry
+
+class aes_ttable(BlockCipher):
+    """AES with precomputed 32-bit lookup tables (T-tables)
+
+    `SubBytes`, `ShiftRows` and `MixColumns` of a round are merged into four
+    table lookups per column, so a round is nothing more than integer
+    lookups, shifts and xors. The result is byte-identical to `aes`, which
+    follows the steps of the specification and is easier to read.
+
+    The state is stored in four 32-bit words, one word per column, the first
+    byte of the column being the most significant one.
+    """
+    def set_key(self, key: bytes) -> None:
+        super().set_key(key)
+        self._Nk = len(key) >> 2
+        self._Nb = 4
+        self._Nr = self._Nk + 6
+        self._ek = [_word(w) for w in _key_expansion(key)]
+        self._dk = _inv_key_schedule(self._ek, self._Nr)
+
+    def encrypt(self, plainText: bytes) -> bytes:
+        return struct.pack('>4I', *self._encrypt_words(struct.unpack('>4I', plainText)))
+
+    def encrypt_blocks(self, buffer: bytes) -> bytes:
+        n = len(buffer) >> 2
+        if len(buffer) & 15:
+            raise ValueError('Data length is not a multiple of the block size')
+        return struct.pack(f'>{n}I', *self._encrypt_words(struct.unpack(f'>{n}I', buffer)))
+
+    def ctr_keystream(self, icb: int, nblocks: int) -> bytes:
+        mask = 0xffffffff
+        words = []
+        for i in range(nblocks):
+            cb = icb + i
+            words += (cb >> 96 & mask, cb >> 64 & mask, cb >> 32 & mask, cb & mask)
+        return struct.pack(f'>{len(words)}I', *self._encrypt_words(words))
+
+    def _encrypt_words(self, words: list[int]) -> list[int]:
+        # All blocks are processed in one loop, tables and round keys are
+        # bound to local variables only once.
+        Te0, Te1, Te2, Te3 = _TE
+        S = _SBOX
+        ek = self._ek
+        rounds = range(4, 4 * self._Nr, 4)
+        k0, k1, k2, k3 = ek[0:4]
+        l0, l1, l2, l3 = ek[-4:]
+        out = []
+        for pos in range(0, len(words), 4):
+            s0, s1, s2, s3 = words[pos:pos+4]
+            s0 ^= k0
+            s1 ^= k1
+            s2 ^= k2
+            s3 ^= k3
+            for k in rounds:
+                t0 = Te0[s0 >> 24] ^ Te1[s1 >> 16 & 255] ^ Te2[s2 >> 8 & 255] ^ Te3[s3 & 255] ^ ek[k]
+                t1 = Te0[s1 >> 24] ^ Te1[s2 >> 16 & 255] ^ Te2[s3 >> 8 & 255] ^ Te3[s0 & 255] ^ ek[k+1]
+                t2 = Te0[s2 >> 24] ^ Te1[s3 >> 16 & 255] ^ Te2[s0 >> 8 & 255] ^ Te3[s1 & 255] ^ ek[k+2]
+                t3 = Te0[s3 >> 24] ^ Te1[s0 >> 16 & 255] ^ Te2[s1 >> 8 & 255] ^ Te3[s2 & 255] ^ ek[k+3]
+                s0, s1, s2, s3 = t0, t1, t2, t3
+            # last round: no MixColumns
+            out += (
+                (S[s0 >> 24] << 24 | S[s1 >> 16 & 255] << 16 | S[s2 >> 8 & 255] << 8 | S[s3 & 255]) ^ l0,
+                (S[s1 >> 24] << 24 | S[s2 >> 16 & 255] << 16 | S[s3 >> 8 & 255] << 8 | S[s0 & 255]) ^ l1,
+                (S[s2 >> 24] << 24 | S[s3 >> 16 & 255] << 16 | S[s0 >> 8 & 255] << 8 | S[s1 & 255]) ^ l2,
+                (S[s3 >> 24] << 24 | S[s0 >> 16 & 255] << 16 | S[s1 >> 8 & 255] << 8 | S[s2 & 255]) ^ l3,
+                )
+        return out
+
+    def decrypt(self, cipherText: bytes) -> bytes:
+        # Equivalent inverse cipher (FIPS 197, 5.3.5)
+        Td0, Td1, Td2, Td3 = _TD
+        S = _INVSBOX
+        dk = self._dk
+        s0, s1, s2, s3 = struct.unpack('>4I', cipherText)
+        s0 ^= dk[0]
+        s1 ^= dk[1]
+        s2 ^= dk[2]
+        s3 ^= dk[3]
+        k = 4
+        for _ in range(self._Nr - 1):
+            t0 = Td0[s0 >> 24] ^ Td1[s3 >> 16 & 255] ^ Td2[s2 >> 8 & 255] ^ Td3[s1 & 255] ^ dk[k]
+            t1 = Td0[s1 >> 24] ^ Td1[s0 >> 16 & 255] ^ Td2[s3 >> 8 & 255] ^ Td3[s2 & 255] ^ dk[k+1]
+            t2 = Td0[s2 >> 24] ^ Td1[s1 >> 16 & 255] ^ Td2[s0 >> 8 & 255] ^ Td3[s3 & 255] ^ dk[k+2]
+            t3 = Td0[s3 >> 24] ^ Td1[s2 >> 16 & 255] ^ Td2[s1 >> 8 & 255] ^ Td3[s0 & 255] ^ dk[k+3]
+            s0, s1, s2, s3 = t0, t1, t2, t3
+            k += 4
+        # last round: no InvMixColumns
+        return struct.pack('>4I',
+            (S[s0 >> 24] << 24 | S[s3 >> 16 & 255] << 16 | S[s2 >> 8 & 255] << 8 | S[s1 & 255]) ^ dk[k],
+            (S[s1 >> 24] << 24 | S[s0 >> 16 & 255] << 16 | S[s3 >> 8 & 255] << 8 | S[s2 & 255]) ^ dk[k+1],
+            (S[s2 >> 24] << 24 | S[s1 >> 16 & 255] << 16 | S[s0 >> 8 & 255] << 8 | S[s3 & 255]) ^ dk[k+2],
+            (S[s3 >> 24] << 24 | S[s2 >> 16 & 255] << 16 | S[s1 >> 8 & 255] << 8 | S[s0 & 255]) ^ dk[k+3],
+            )
+
+
+def _word(word: tuple[int, int, int, int]) -> int:
+    return word[0] << 24 | word[1] << 16 | word[2] << 8 | word[3]
+
+def _inv_key_schedule(ek: list[int], Nr: int) -> list[int]:
+    # Round keys in reverse order, InvMixColumns applied to the inner ones.
+    # InvMixColumns(w) = Td(SBOX(w)), since Td contains InvSubBytes.
+    Td0, Td1, Td2, Td3 = _TD
+    S = _SBOX
+    dk = ek[4*Nr:4*Nr+4]
+    for round in range(Nr - 1, 0, -1):
+        for w in ek[4*round:4*round+4]:
+            dk.append(Td0[S[w >> 24]] ^ Td1[S[w >> 16 & 255]]
+                    ^ Td2[S[w >> 8 & 255]] ^ Td3[S[w & 255]])
+    dk += ek[0:4]
+    return dk
+
+def _xtime(b: int) -> int:
+    # multiplication by x (i.e. 2) in GF(2^8) (FIPS 197, 4.2.1)
+    b <<= 1
+    return b ^ 0x11b if b & 0x100 else b
+
+def _ror8(w: int) -> int:
+    return w >> 8 | (w & 255) << 24
+
+def _gen_tables() -> tuple[tuple, tuple]:
+    te0 = []
+    td0 = []
+    for x in range(256):
+        s = _SBOX[x]
+        s2 = _xtime(s)
+        te0.append(s2 << 24 | s << 16 | s << 8 | s2 ^ s)
+        s = _INVSBOX[x]
+        s2 = _xtime(s)
+        s4 = _xtime(s2)
+        s8 = _xtime(s4)
+        s9 = s8 ^ s
+        te = s8 ^ s4 ^ s2
+        td0.append(te << 24 | s9 << 16 | (s9 ^ s4) << 8 | s9 ^ s2)
+    te = [te0]
+    td = [td0]
+    for _ in range(3):
+        te.append([_ror8(w) for w in te[-1]])
+        td.append([_ror8(w) for w in td[-1]])
+    return tuple(te), tuple(td)
+
+_TE, _TD = _gen_tables()
+
+Registry.add(aes_ttable)
@@ -26,6 +26,51 @@ class BlockCipher(ABC, metaclass = BlockCipherMeta):
         # Often encrypt and decrypt is the same function
         return self.encrypt(cipherText)
 
+    def encrypt_blocks(self, buffer: bytes) -> bytes:
+        """Encrypt several consecutive blocks (ECB) in a single call
+
+        Ciphers can override this to avoid the per-block overhead of
+        `encrypt`.
+
+        Parameters
+        ----------
+        buffer : bytes like
+            Data, its length must be a multiple of the block size
+
+        Returns
+        -------
+        bytes
+            Encrypted blocks
+        """
+        size = self.block_size >> 3
+        if len(buffer) % size:
+            raise ValueError('Data length is not a multiple of the block size')
+        buffer = memoryview(buffer)
+        return b''.join(self.encrypt(bytes(buffer[pos:pos+size]))
+                                        for pos in range(0, len(buffer), size))
+
+    def ctr_keystream(self, icb: int, nblocks: int) -> bytes:
+        """Generate counter mode key stream (NIST SP 800-38A, 6.5)
+
+        The counter is incremented over the whole block (modulo 2^block_size).
+
+        Parameters
+        ----------
+        icb : int
+            Initial counter block
+        nblocks : int
+            Number of key stream blocks to generate
+
+        Returns
+        -------
+        bytes
+            Encrypted counter blocks `icb`, `icb+1`, ... `icb+nblocks-1`
+        """
+        size = self.block_size >> 3
+        mask = (1 << self.block_size) - 1
+        return self.encrypt_blocks(b''.join(
+            (icb + i & mask).to_bytes(size, 'big') for i in range(nblocks)))
+
 class NoEncryption(BlockCipher):
     def encrypt(self, plainText: bytes):
         return plainText
@@ -0,0 +1,18 @@
+#!/usr/bin/python3
+
+def constant_time_equal(a: bytes, b: bytes) -> bool:
+    """Compare two byte strings in time independent of their content
+
+    Every byte pair is processed, even if a difference has already been
+    found, so the comparison time does not leak the position of the first
+    difference (e.g. of an authentication tag). The length is not secret.
+
+    Note, that Python itself gives no real timing guarantees; this only shows
+    the method.
+    """
+    if len(a) != len(b):
+        return False
+    result = 0
+    for x, y in zip(a, b):
+        result |= x ^ y
+    return result == 0
@@ -7,6 +7,10 @@ from .hkdf import HKDF
 from .hash import Registry as HashRegistry
 
 class CryptoSuite:
+    # Registered variant of the hash function preferred, if exists (e.g.
+    # 'sha256_unrolled' for 'sha256'). None: use the reference implementation
+    hash_variant: str|None = 'unrolled'
+
     def __init__(self, cipher_suite: int|str|CipherSuite):
         if isinstance(cipher_suite, int):
             self.cipher_suite = CIPHER_SUITE_BY_ID.get(cipher_suite)
@@ -17,7 +21,12 @@ class CryptoSuite:
         self.setup_cipher_suite()
 
     def setup_cipher_suite(self):
-        self.hash_function = HashRegistry.get(self.cipher_suite.hash)
+        self.hash_function = None
+        if self.hash_variant is not None:
+            self.hash_function = HashRegistry.get(
+                                f'{self.cipher_suite.hash}_{self.hash_variant}')
+        if self.hash_function is None:
+            self.hash_function = HashRegistry.get(self.cipher_suite.hash)
         if self.hash_function is None:
             raise NotImplementedError(f'Hash function {self.cipher_suite.hash} not implemented')
         self.hkdf = HKDF(self.hash_function)
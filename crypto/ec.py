@@ -28,10 +28,9 @@ def Weierstrass(*, a, b, p):
                 if self.y is None:
                     self.calculate_y()
 
-        def calculate_y(self, x: int) -> None:
+        def calculate_y(self) -> None:
             M = Modular(_EC.p)
             x = M(self.x)
-            y = M(self.y)
             a = M(self.a)
             b = M(self.b)
             z = x * x * x + a * x + b
@@ -73,6 +72,49 @@ def Weierstrass(*, a, b, p):
                 n >>= 1
             return p
 
+        def multiply(self, n: int, *, window: int = 4):
+            """Scalar multiplication n*P in Jacobian coordinates
+
+            Same result as `n * P`, but the point additions and doublings
+            need no modular inversion: a point (x, y) is represented as
+            (X, Y, Z) with x = X/Z^2, y = Y/Z^3, and there is a single
+            inversion at the end. The scalar is processed in width-w NAF
+            form, so only every ~(w+1)th step needs an addition.
+
+            Note, that the running time depends on the scalar.
+
+            Parameters
+            ----------
+            n : int
+                Scalar
+            window : int, default=4
+                Width of the NAF window; 2^(window-2) points are precomputed
+            """
+            a = _EC.a
+            p = _EC.p
+            if n < 0:
+                return _EC(self.x, -self.y % p).multiply(-n, window=window)
+            P = (self.x, self.y, 1)
+            # odd multiples: P, 3P, 5P, ...
+            P2 = _jacobian_double(P, a, p)
+            table = [P]
+            for _ in range((1 << window - 2) - 1):
+                table.append(_jacobian_add(table[-1], P2, a, p))
+            Q = (1, 1, 0) # point at infinity
+            for d in reversed(_wnaf(n, window)):
+                Q = _jacobian_double(Q, a, p)
+                if d > 0:
+                    Q = _jacobian_add(Q, table[d >> 1], a, p)
+                elif d < 0:
+                    X, Y, Z = table[-d >> 1]
+                    Q = _jacobian_add(Q, (X, p - Y, Z), a, p)
+            X, Y, Z = Q
+            if Z == 0:
+                return _EC(0, 0)
+            zinv = pow(Z, -1, p)
+            zinv2 = zinv * zinv % p
+            return _EC(X * zinv2 % p, Y * zinv2 * zinv % p)
+
     _EC.a = a
     _EC.b = b
     _EC.p = p
@@ -83,6 +125,92 @@ def Weierstrass(*, a, b, p):
     _EC.bits = bits
     return _EC
 
+# ---- Jacobian coordinates (x = X/Z^2, y = Y/Z^3, infinity: Z = 0) ----
+# ref: https://hyperelliptic.org/EFD/g1p/auto-shortw-jacobian.html
+# (dbl-2007-bl, add-2007-bl without the "2*" tricks)
+
+def _jacobian_double(P: tuple[int, int, int], a: int, p: int) -> tuple[int, int, int]:
+    X1, Y1, Z1 = P
+    if Z1 == 0 or Y1 == 0:
+        return (1, 1, 0)
+    XX = X1 * X1 % p
+    YY = Y1 * Y1 % p
+    YYYY = YY * YY % p
+    ZZ = Z1 * Z1 % p
+    S = 4 * X1 * YY % p
+    M = (3 * XX + a * ZZ * ZZ) % p
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YYYY) % p
+    Z3 = 2 * Y1 * Z1 % p
+    return (X3, Y3, Z3)
+
+def _jacobian_add(P: tuple[int, int, int], Q: tuple[int, int, int],
+        a: int, p: int) -> tuple[int, int, int]:
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if Z1 == 0:
+        return Q
+    if Z2 == 0:
+        return P
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    U2 = X2 * Z1Z1 % p
+    S1 = Y1 * Z2 * Z2Z2 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    H = (U2 - U1) % p
+    R = (S2 - S1) % p
+    if H == 0:
+        if R == 0: # P == Q
+            return _jacobian_double(P, a, p)
+        return (1, 1, 0) # P == -Q
+    HH = H * H % p
+    HHH = H * HH % p
+    V = U1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    Y3 = (R * (V - X3) - S1 * HHH) % p
+    Z3 = Z1 * Z2 * H % p
+    return (X3, Y3, Z3)
+
+def jacobian_to_affine(points: list[tuple[int, int, int]], p: int
+        ) -> list[tuple[int, int]|None]:
+    """Affine coordinates of several Jacobian points with a single inversion
+
+    The point at infinity (Z = 0) is returned as None.
+    """
+    finite = [P for P in points if P[2] != 0]
+    zinvs = iter(Modular(p).batch_inverse([Z for _, _, Z in finite]))
+    result = []
+    for X, Y, Z in points:
+        if Z == 0:
+            result.append(None)
+            continue
+        zinv = next(zinvs).value
+        zinv2 = zinv * zinv % p
+        result.append((X * zinv2 % p, Y * zinv2 * zinv % p))
+    return result
+
+def _wnaf(n: int, w: int) -> list[int]:
+    """Width-w non-adjacent form of n, least significant digit first
+
+    Every non-zero digit is odd, |d| < 2^(w-1), and it is followed by at
+    least w-1 zeros.
+    """
+    digits = []
+    half = 1 << w - 1
+    full = 1 << w
+    while n:
+        if n & 1:
+            d = n & full - 1
+            if d >= half:
+                d -= full
+            n -= d
+        else:
+            d = 0
+        digits.append(d)
+        n >>= 1
+    return digits
+
 def Montgomery(*, A, p, bits):
     # y^2 = x^3 + Ax^2 + x
     class _EC:
@@ -146,3 +274,143 @@ def Montgomery(*, A, p, bits):
 
 EC25519 = Montgomery(A=486662, p=2**255 - 19, bits=255)
 EC448 = Montgomery(A=156326, p=2**448 - 2**224 - 1, bits=448)
+
+
+def montgomery_ladder(k: int, u: int, *, A: int, p: int, bits: int) -> int:
+    """Scalar multiplication on the u-line of a Montgomery curve (RFC 7748, 5.)
+
+    The same ladder as `Montgomery.__rmul__`, but on native integers: no
+    field element objects are created. For 2^255-19 a variant with
+    specialised reduction is used.
+
+    Parameters
+    ----------
+    k : int
+        Scalar (already decoded/clamped)
+    u : int
+        u-coordinate of the point
+    A : int
+        Curve parameter
+    p : int
+        Prime of the field
+    bits : int
+        Number of bits of the scalar to process
+
+    Returns
+    -------
+    int
+        u-coordinate of k*u
+    """
+    if p == _P25519 and A == 486662 and bits == 255:
+        return _ladder_25519(k, u)
+    return _ladder(k, u, (A - 2) >> 2, p, bits)
+
+def _ladder(k: int, u: int, a24: int, p: int, bits: int) -> int:
+    x_1 = u % p
+    x_2 = 1
+    z_2 = 0
+    x_3 = x_1
+    z_3 = 1
+    swap = 0
+    for t in range(bits-1, -1, -1):
+        k_t = (k >> t) & 1
+        swap ^= k_t
+        # cswap: constant time, using mask (0 or -1) instead of branch
+        mask = -swap
+        dummy = mask & (x_2 ^ x_3)
+        x_2 ^= dummy
+        x_3 ^= dummy
+        dummy = mask & (z_2 ^ z_3)
+        z_2 ^= dummy
+        z_3 ^= dummy
+        swap = k_t
+
+        A = x_2 + z_2
+        AA = A * A % p
+        B = x_2 - z_2
+        BB = B * B % p
+        E = AA - BB
+        C = x_3 + z_3
+        D = x_3 - z_3
+        DA = D * A % p
+        CB = C * B % p
+        x_3 = (DA + CB) ** 2 % p
+        z_3 = x_1 * ((DA - CB) ** 2 % p) % p
+        x_2 = AA * BB % p
+        z_2 = E * (AA + a24 * E) % p
+
+    mask = -swap
+    dummy = mask & (x_2 ^ x_3)
+    x_2 ^= dummy
+    dummy = mask & (z_2 ^ z_3)
+    z_2 ^= dummy
+    return x_2 * pow(z_2, p - 2, p) % p
+
+_P25519 = 2**255 - 19
+_M255 = (1 << 255) - 1
+
+def _ladder_25519(k: int, u: int) -> int:
+    # Reduction modulo 2^255-19: x = h*2^255 + l = 19*h + l (mod p)
+    # Products are "folded" this way instead of the (slower) division.
+    # A single fold after a product of partially reduced values keeps them
+    # below 2^266, two folds below 2^256. Differences of twice folded values
+    # are shifted by 2p, differences of once folded ones (below 2^264) by
+    # 2^10*p, so that every value stays non-negative (cswap uses xor).
+    M = _M255
+    p2 = 2 * _P25519
+    p1024 = 1024 * _P25519
+    x_1 = u % _P25519
+    x_2 = 1
+    z_2 = 0
+    x_3 = x_1
+    z_3 = 1
+    swap = 0
+    for t in range(254, -1, -1):
+        k_t = (k >> t) & 1
+        swap ^= k_t
+        mask = -swap
+        dummy = mask & (x_2 ^ x_3)
+        x_2 ^= dummy
+        x_3 ^= dummy
+        dummy = mask & (z_2 ^ z_3)
+        z_2 ^= dummy
+        z_3 ^= dummy
+        swap = k_t
+
+        A = x_2 + z_2
+        r = A * A
+        AA = (r & M) + 19 * (r >> 255)
+        B = x_2 - z_2 + p2
+        r = B * B
+        BB = (r & M) + 19 * (r >> 255)
+        E = AA - BB + p1024
+        C = x_3 + z_3
+        D = x_3 - z_3 + p2
+        r = D * A
+        DA = (r & M) + 19 * (r >> 255)
+        r = C * B
+        CB = (r & M) + 19 * (r >> 255)
+        r = DA + CB
+        r = r * r
+        r = (r & M) + 19 * (r >> 255)
+        x_3 = (r & M) + 19 * (r >> 255)
+        r = DA - CB + p1024
+        r = r * r
+        r = (r & M) + 19 * (r >> 255)
+        r = x_1 * r
+        r = (r & M) + 19 * (r >> 255)
+        z_3 = (r & M) + 19 * (r >> 255)
+        r = AA * BB
+        r = (r & M) + 19 * (r >> 255)
+        x_2 = (r & M) + 19 * (r >> 255)
+        r = E * (AA + 121665 * E)
+        r = (r & M) + 19 * (r >> 255)
+        z_2 = (r & M) + 19 * (r >> 255)
+
+    mask = -swap
+    dummy = mask & (x_2 ^ x_3)
+    x_2 ^= dummy
+    dummy = mask & (z_2 ^ z_3)
+    z_2 ^= dummy
+    p = _P25519
+    return x_2 % p * pow(z_2, p - 2, p) % p
@@ -4,6 +4,7 @@ import secrets
 from crypto import ec
 from util.serialize import *
 from .groupinfo import WeierstrassGroup, MontgomeryGroup
+from .fixedbase import fixed_base_table
 
 def ECDH(group: WeierstrassGroup|MontgomeryGroup):
     if isinstance(group, WeierstrassGroup):
@@ -32,14 +33,15 @@ class ECDHWeierstrass:
     def generate_key_pair(self, priv: bytes|int|None = None) -> (bytes, bytes):
         bits = self.group.bits
         size = bits + 7 >> 3
-        G = self.ec(self.group.Gx, self.group.Gy)
         if priv is None:
             priv = secrets.randbelow(self.group.p)
         if isinstance(priv, bytes):
             priv = int.from_bytes(priv, size)
-        pub_ec = priv * G
-#>        pub = ECDHWeierstrass.PublicKey(size, pub_ec.x, pub_ec.y)
-        pub = b'\x04' + pack_uint(pub_ec.x, size) + pack_uint(pub_ec.y, size)
+        # priv * G, using the precomputed multiples of G
+        pub_xy = fixed_base_table(self.group.id).multiply(priv % self.group.n)
+        x, y = pub_xy or (0, 0)
+#>        pub = ECDHWeierstrass.PublicKey(size, x, y)
+        pub = b'\x04' + pack_uint(x, size) + pack_uint(y, size)
         return priv, pub
 
     def create_secret(self, my_priv: bytes|int, peer_pub) -> bytes:
@@ -52,7 +54,7 @@ class ECDHWeierstrass:
         )
         if isinstance(my_priv, bytes):
             my_priv = int.from_bytes(my_priv, size)
-        secret = my_priv * pub_ec
+        secret = pub_ec.multiply(my_priv)
         return pack_uint(secret.x, size)
 
 
@@ -75,29 +77,31 @@ class ECDHMontgomery:
         bits = self.group.bits
         cofactor = self.group.cofactor
         k_i = int.from_bytes(k, 'little')
-        return k_i & ~(cofactor - 1) | (1 << bits - 1)
+        return k_i & ((1 << bits) - 1) & ~(cofactor - 1) | (1 << bits - 1)
 
     def apply(self, k: bytes, u: bytes) -> bytes:
-        bits = self.group.bits
-        p = self.group.p
+        # Note: ec.Montgomery arithmetic (k_i * self.ec(u_i)) gives the same
+        # result, but it is several times slower.
+        group = self.group
         k_i = self.decode_scalar(k)
-        u_ec = self.ec(self.decode_ucoordinate(u))
-        r_ec = k_i * u_ec
-        return self.encode_ucoordinate(int(r_ec), p)
+        u_i = self.decode_ucoordinate(u)
+        r = ec.montgomery_ladder(k_i, u_i, A=group.A, p=group.p, bits=group.bits)
+        return self.encode_ucoordinate(r, group.p)
 
     def generate_key_pair(self, priv: bytes|int|None = None) -> (bytes, bytes):
         bits = self.group.bits
         size = bits + 7 >> 3
         cofactor = self.group.cofactor
-        U_P = self.group.U_P
-        g = U_P.to_bytes(size, 'little')
         if priv is None:
             priv_n = secrets.randbits(bits - 1) \
                                         & ~(cofactor - 1) | (1 << bits - 1)
             priv = priv_n.to_bytes(size, 'little')
         if isinstance(priv, int):
             priv = priv.to_bytes(size, 'big')
-        pub = self.apply(priv, g)
+        # same as self.apply(priv, U_P), using the precomputed multiples of U_P
+        k_i = self.decode_scalar(priv)
+        pub_uv = fixed_base_table(self.group.id).multiply(k_i)
+        pub = self.encode_ucoordinate(pub_uv[0] if pub_uv else 0, self.group.p)
         return priv, pub
 
     def create_secret(self, my_priv: bytes, peer_pub: bytes) -> bytes:
@@ -0,0 +1,250 @@
+#!/usr/bin/python3
+# Fixed-base scalar multiplication with precomputed multiples of the generator
+# ref: Handbook of Applied Cryptography, 14.6.3 (fixed-base exponentiation)
+
+import json
+import os
+import threading
+from .ec import jacobian_to_affine, _jacobian_add, _jacobian_double
+from .groupinfo import GROUP_INFO_BY_ID, WeierstrassGroup, MontgomeryGroup
+
+_WINDOW = 4
+
+_tables: dict[int, 'FixedBaseTable'] = {}
+_lock = threading.Lock()
+_cache_dir: str|None = None
+
+class FixedBaseTable:
+    """Multiples of a fixed point of a short Weierstrass curve
+
+    Row `i` of the table contains j * 16^i * G for j = 1..15 in affine
+    coordinates, so k * G is the sum of one table entry per radix-16 digit of
+    k: no doubling at all, and only cheap mixed (Jacobian + affine)
+    additions.
+
+    Montgomery curves (v^2 = u^3 + A*u^2 + u) are handled by the change of
+    variables x = u + A/3; then `offset` is A/3, and `multiply` returns the
+    u-coordinate (x - offset).
+
+    Parameters
+    ----------
+    a, p : int
+        Curve parameters (y^2 = x^3 + a*x + b mod p)
+    G : tuple[int, int]
+        Affine coordinates of the base point
+    bits : int
+        Maximum bit length of the scalars
+    offset : int, default=0
+        Value to be subtracted from the x-coordinate of the result
+    rows : list, optional
+        Precomputed table (e.g. loaded from disk), computed if not given
+    """
+    def __init__(self, a: int, p: int, G: tuple[int, int], bits: int, *,
+            offset: int = 0, rows: list[list[tuple[int, int]]]|None = None):
+        self.a = a
+        self.p = p
+        self.G = G
+        self.bits = bits
+        self.offset = offset
+        self.rows = rows if rows is not None else self._build()
+
+    def _build(self) -> list[list[tuple[int, int]]]:
+        a, p = self.a, self.p
+        n = (1 << _WINDOW) - 1
+        points = []
+        base = (*self.G, 1)
+        for _ in range((self.bits + _WINDOW - 1) // _WINDOW):
+            Q = base
+            for _ in range(n):
+                points.append(Q)
+                Q = _jacobian_add(Q, base, a, p)
+            base = Q # 16^(i+1) * G
+        # a single inversion for the whole table
+        points = jacobian_to_affine(points, p)
+        return [points[i:i+n] for i in range(0, len(points), n)]
+
+    def multiply(self, k: int) -> tuple[int, int]|None:
+        """Calculate k * G
+
+        Parameters
+        ----------
+        k : int
+            Non-negative scalar shorter than `bits`
+
+        Returns
+        -------
+        tuple[int, int] or None
+            Affine coordinates of the result (x shifted by `offset`), or None
+            for the point at infinity
+        """
+        if k < 0 or k.bit_length() > len(self.rows) * _WINDOW:
+            raise ValueError('Scalar out of range')
+        a, p = self.a, self.p
+        Q = (1, 1, 0)
+        mask = (1 << _WINDOW) - 1
+        for row in self.rows:
+            d = k & mask
+            if d:
+                Q = _jacobian_add_affine(Q, row[d - 1], a, p)
+            k >>= _WINDOW
+        if Q[2] == 0:
+            return None
+        x, y = jacobian_to_affine([Q], p)[0]
+        return (x - self.offset) % p, y
+
+    def dump(self) -> dict:
+        return {
+            'a': hex(self.a), 'p': hex(self.p),
+            'G': [hex(c) for c in self.G],
+            'bits': self.bits, 'offset': hex(self.offset),
+            'rows': [[[hex(x), hex(y)] for x, y in row] for row in self.rows],
+            }
+
+    @classmethod
+    def load(cls, data: dict) -> 'FixedBaseTable':
+        return cls(int(data['a'], 16), int(data['p'], 16),
+            tuple(int(c, 16) for c in data['G']), data['bits'],
+            offset=int(data['offset'], 16),
+            rows=[[(int(x, 16), int(y, 16)) for x, y in row]
+                for row in data['rows']])
+
+
+def set_cache_dir(path: str|None) -> None:
+    """Directory for persisting the tables; None (default) disables it"""
+    global _cache_dir
+    _cache_dir = path
+
+def fixed_base_table(group_id: int) -> FixedBaseTable:
+    """Precomputed table of the generator of a group (built on first use)
+
+    If a cache directory is set (`set_cache_dir`), the table is loaded from
+    there, or saved there after building it.
+
+    Parameters
+    ----------
+    group_id : int
+        Key of the group in `GROUP_INFO_BY_ID`
+    """
+    table = _tables.get(group_id)
+    if table is not None:
+        return table
+    with _lock:
+        table = _tables.get(group_id)
+        if table is None:
+            table = _tables[group_id] = _load_or_build(GROUP_INFO_BY_ID[group_id])
+    return table
+
+def _new_table(group) -> FixedBaseTable:
+    if isinstance(group, WeierstrassGroup):
+        return FixedBaseTable(group.a, group.p, (group.Gx, group.Gy),
+            group.n.bit_length())
+    elif isinstance(group, MontgomeryGroup):
+        p = group.p
+        A = group.A
+        offset = A * pow(3, -1, p) % p
+        a = (3 - A * A) * pow(3, -1, p) % p
+        return FixedBaseTable(a, p, ((group.U_P + offset) % p, group.V_P),
+            group.bits, offset=offset)
+    else:
+        raise TypeError('Invalid EC group')
+
+def _load_or_build(group) -> FixedBaseTable:
+    if _cache_dir is None:
+        return _new_table(group)
+    path = os.path.join(_cache_dir, f'{group.idstr}.fbt.json')
+    try:
+        with open(path) as f:
+            table = FixedBaseTable.load(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        table = None
+    if table is not None and _matches(table, group):
+        return table
+    table = _new_table(group)
+    # atomic replace: concurrent processes never see a partial file
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(_cache_dir, exist_ok=True)
+        with open(tmp, 'w') as f:
+            json.dump(table.dump(), f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return table
+
+def _matches(table: FixedBaseTable, group) -> bool:
+    # check of a loaded table: parameters, shape and every single entry
+    if isinstance(group, WeierstrassGroup):
+        a = group.a
+        G = (group.Gx, group.Gy)
+        bits = group.n.bit_length()
+    else:
+        a = (3 - group.A * group.A) * pow(3, -1, group.p) % group.p
+        G = ((group.U_P + table.offset) % group.p, group.V_P)
+        bits = group.bits
+    return (table.a == a and table.p == group.p and table.G == G
+        and table.bits == bits
+        and len(table.rows) == (bits + _WINDOW - 1) // _WINDOW
+        and all(len(row) == (1 << _WINDOW) - 1 for row in table.rows)
+        and table.rows[0][0] == G
+        and _consistent(table))
+
+def _consistent(table: FixedBaseTable) -> bool:
+    # Every entry must be the sum of the previous one and the first one of
+    # its row (and the first entry of the next row the sum of the last one
+    # and the first one), starting from G. The sums are checked with the
+    # chord and tangent equations, without inversion: a table passing this
+    # contains exactly the multiples of G, even if the file was tampered.
+    a, p = table.a, table.p
+    for i, row in enumerate(table.rows):
+        B = row[0]
+        nxt = table.rows[i + 1][0] if i + 1 < len(table.rows) else None
+        if not _is_double(B, row[1], a, p):
+            return False
+        for P, R in zip(row[1:], row[2:] + [nxt]):
+            if R is not None and not _is_sum(P, B, R, p):
+                return False
+    return True
+
+def _is_sum(P: tuple[int, int], Q: tuple[int, int], R: tuple[int, int],
+        p: int) -> bool:
+    # R == P + Q (P != +-Q): lambda = dy / dx,
+    # xR = lambda^2 - xP - xQ, yR = lambda * (xP - xR) - yP
+    (xP, yP), (xQ, yQ), (xR, yR) = P, Q, R
+    dx = (xQ - xP) % p
+    dy = yQ - yP
+    return (dx != 0
+        and (xR + xP + xQ) * dx * dx % p == dy * dy % p
+        and (yR + yP) * dx % p == dy * (xP - xR) % p)
+
+def _is_double(P: tuple[int, int], R: tuple[int, int], a: int, p: int) -> bool:
+    # R == 2 * P: lambda = (3 * xP^2 + a) / (2 * yP)
+    (xP, yP), (xR, yR) = P, R
+    d = 2 * yP % p
+    n = 3 * xP * xP + a
+    return (d != 0
+        and (xR + 2 * xP) * d * d % p == n * n % p
+        and (yR + yP) * d % p == n * (xP - xR) % p)
+
+def _jacobian_add_affine(P: tuple[int, int, int], Q: tuple[int, int],
+        a: int, p: int) -> tuple[int, int, int]:
+    # mixed addition (Z2 = 1), EFD madd-2007-bl without the "2*" tricks
+    X1, Y1, Z1 = P
+    x2, y2 = Q
+    if Z1 == 0:
+        return (x2, y2, 1)
+    Z1Z1 = Z1 * Z1 % p
+    U2 = x2 * Z1Z1 % p
+    S2 = y2 * Z1 * Z1Z1 % p
+    H = (U2 - X1) % p
+    R = (S2 - Y1) % p
+    if H == 0:
+        if R == 0:
+            return _jacobian_double(P, a, p)
+        return (1, 1, 0)
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (R * R - HHH - 2 * V) % p
+    Y3 = (R * (V - X3) - Y1 * HHH) % p
+    Z3 = Z1 * H % p
+    return (X3, Y3, Z3)
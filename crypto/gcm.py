@@ -1,16 +1,35 @@
 #!/usr/bin/python3
 
+from .constanttime import constant_time_equal
 from .polynomial import Polynomial
-from .encryption import Encryption
+from .cipher.blockcipher import BlockCipher
 
 class GCM:
+    """Galois/Counter Mode (NIST SP 800-38D)
+
+    Parameters
+    ----------
+    encryption : BlockCipher
+        Block cipher with a block size of 128 bits, and the key already set
+    table_bits : int or None, default=8
+        Width of the precomputed multiplication tables used by GHASH (Shoup's
+        method). 8 bits need 256+256 entries, 4 bits only 16+16, but twice
+        as many steps per block. If `None`, the hash key multiplication uses
+        the `Polynomial` arithmetic (slow, but straightforward).
+    """
     poly: Polynomial
-    encryption: Encryption
+    encryption: BlockCipher
+    table_bits: int|None
 
-    def __init__(self, encryption: Encryption):
+    def __init__(self, encryption: BlockCipher, *, table_bits: int|None = 8):
+        if table_bits not in (None, 4, 8):
+            raise ValueError('Table width must be 4 or 8 bits')
         self.poly = Polynomial([128, 7, 2, 1, 0], reverse=True)
         self.encryption = encryption
+        self.table_bits = table_bits
         self.h = self.poly(int.from_bytes(encryption.encrypt(b'\0'*16), 'big'))
+        if table_bits is not None:
+            self._mul_h = _table_multiplier(self.h.value, table_bits)
 
     def nonce_toIV(self, nonce: bytes):
         if len(nonce) == 12:
@@ -22,43 +41,260 @@ class GCM:
         return int.from_bytes(iv)
 
     def encrypt(self, plain_text: bytes, auth_data: bytes, nonce: bytes) -> (bytes, bytes):
-        iv = self.nonce_toIV(nonce)
-        p = plain_text
-        c = self.gctr(iv + 1, p)
-        u = (-len(c)) % 16
-        v = (-len(auth_data)) % 16
-        # length is in bits (not documented in RFC):
-        s = self.ghash(auth_data + (b'\0' * v) + c + (b'\0' * u)
-            + (len(auth_data)*8).to_bytes(8, 'big') + (len(c)*8).to_bytes(8, 'big'))
-        t = self.gctr(iv, s)[:16]
+        stream = self.stream(nonce)
+        stream.update_aad(auth_data)
+        c = stream.update(plain_text)
+        t = stream.finalize()
         return c, t
 
     def decrypt(self, cipher_text: bytes, auth_data: bytes, nonce: bytes) -> (bytes, bytes):
+        stream = self.stream(nonce, decrypt=True)
+        stream.update_aad(auth_data)
+        p = stream.update(cipher_text)
+        t = stream.finalize()
+        return p, t
+
+    def decrypt_and_verify(self, cipher_text: bytes, auth_data: bytes,
+            nonce: bytes, auth_tag: bytes) -> bytes:
+        """Authenticate, then decrypt a message
+
+        The tag is calculated from the cipher text first, and the text is
+        only decrypted if it matches, so forged messages do not cost a
+        decryption.
+
+        Returns
+        -------
+        bytes
+            Plain text
+
+        Raises
+        ------
+        ValueError
+            Authentication tag does not match
+        """
         iv = self.nonce_toIV(nonce)
         c = cipher_text
-        p = self.gctr(iv + 1, c)
-        u = (-len(c)) % 16
-        v = (-len(auth_data)) % 16
-        s = self.ghash(auth_data + (b'\0' * v) + c + (b'\0' * u)
-            + (len(auth_data)*8).to_bytes(8, 'big') + (len(c)*8).to_bytes(8, 'big'))
-        t = self.gctr(iv, s)[:16]
-        return p, t
+        # AAD and text are padded to full block by ghash_update
+        s = self.ghash_update(0, auth_data)
+        s = self.ghash_update(s, c)
+        s = self.ghash_update(s, (len(auth_data)*8).to_bytes(8, 'big')
+                                                + (len(c)*8).to_bytes(8, 'big'))
+        t = self.gctr(iv, s.to_bytes(16, 'big'))
+        if not constant_time_equal(t, auth_tag):
+            raise ValueError('Authentication tag mismatch')
+        return self.gctr(iv + 1, c)
+
+    def stream(self, nonce: bytes, *, decrypt: bool = False) -> 'GCMStream':
+        """Create an incremental encryption/decryption context
+
+        See `GCMStream`
+        """
+        return GCMStream(self, nonce, decrypt=decrypt)
 
     def ghash(self, x: bytes) -> bytes:
-        _P = self.poly
-        h = self.h
-        yi = _P(0)
+        return self.ghash_update(0, x).to_bytes(16, 'big')
+
+    def ghash_update(self, yi: int, x: bytes) -> int:
+        """Continue GHASH calculation with further blocks
+
+        Parameters
+        ----------
+        yi : int
+            Current GHASH value (0 at the beginning)
+        x : bytes
+            Next blocks, the last one is padded with zeros if incomplete
+
+        Returns
+        -------
+        int
+            Updated GHASH value
+        """
+        if self.table_bits is None:
+            _P = self.poly
+            h = self.h
+            yi = _P(yi)
+            for pos in range(0, len(x), 16):
+                xi = _P(int.from_bytes((x[pos:pos+16] + b'\0' * 15)[:16], 'big'))
+                yi = (yi ^ xi) * h
+            return yi.value
+        mul_h = self._mul_h
         for pos in range(0, len(x), 16):
-            xi = _P(int.from_bytes((x[pos:pos+16] + b'\0' * 15)[:16], 'big'))
-            yi = (yi ^ xi) * h
-        return yi.value.to_bytes(16, 'big')
+            xi = int.from_bytes(x[pos:pos+16].ljust(16, b'\0'), 'big')
+            yi = mul_h(yi ^ xi)
+        return yi
 
     def gctr(self, icb: int, x: bytes) -> bytes:
-        y = []
-        for pos in range(0, len(x), 16):
-            xi = x[pos:pos+16]
-            key = self.encryption.encrypt(icb.to_bytes(16, 'big'))
-            xored = bytes(x^y for x, y in zip(xi, key))
-            y.append(xored)
-            icb += 1
-        return b''.join(y)
+        if not x:
+            return b''
+        # The whole key stream is generated at once, and xored with x as a
+        # single (big) integer
+        key = self.encryption.ctr_keystream(icb, len(x) + 15 >> 4)[:len(x)]
+        y = int.from_bytes(x, 'big') ^ int.from_bytes(key, 'big')
+        return y.to_bytes(len(x), 'big')
+
+
+class GCMStream:
+    """Incremental GCM encryption or decryption
+
+    The additional authenticated data and the text can be passed in chunks of
+    any size, only the running GHASH value, the counter and less than a
+    block of each are kept, so the memory use is independent of the message
+    size.
+
+    Usage::
+
+        stream = gcm.stream(nonce)
+        stream.update_aad(auth_data)
+        cipher_text = stream.update(chunk1) + stream.update(chunk2)
+        auth_tag = stream.finalize()
+
+    Parameters
+    ----------
+    gcm : GCM
+        Prepared GCM (cipher and hash key)
+    nonce : bytes
+        Nonce (IV) of the message
+    decrypt : bool, default=False
+        Decrypt the chunks passed to `update` instead of encrypting them
+    """
+    def __init__(self, gcm: GCM, nonce: bytes, *, decrypt: bool = False):
+        self.gcm = gcm
+        self.decrypt = decrypt
+        self._iv = gcm.nonce_toIV(nonce)
+        self._counter = self._iv + 1
+        self._keystream = b''
+        self._y = 0
+        self._pending = b'' # incomplete block, not hashed yet
+        self._aad_len = 0
+        self._text_len = 0
+        self._aad_done = False
+        self._tag = None
+
+    def update_aad(self, data: bytes) -> None:
+        """Add additional authenticated data
+
+        Must be called before the first `update`.
+        """
+        if self._aad_done:
+            raise ValueError('Additional data must precede the text')
+        self._aad_len += len(data)
+        self._hash(data)
+
+    def update(self, data: bytes) -> bytes:
+        """Encrypt or decrypt the next chunk of the text"""
+        if self._tag is not None:
+            raise ValueError('Stream is already finalized')
+        if not self._aad_done:
+            self._close_aad()
+        size = len(data)
+        if size == 0:
+            return b''
+        self._text_len += size
+        keystream = self._keystream
+        if len(keystream) < size:
+            nblocks = size - len(keystream) + 15 >> 4
+            keystream += self.gcm.encryption.ctr_keystream(self._counter, nblocks)
+            self._counter += nblocks
+        self._keystream = keystream[size:]
+        out = (int.from_bytes(data, 'big')
+                ^ int.from_bytes(keystream[:size], 'big')).to_bytes(size, 'big')
+        self._hash(data if self.decrypt else out)
+        return out
+
+    def finalize(self) -> bytes:
+        """Finish the message and return the authentication tag
+
+        In case of decryption this is the tag calculated from the received
+        text; compare it with the received one, or use `verify`.
+        """
+        if self._tag is None:
+            if not self._aad_done:
+                self._close_aad()
+            # length is in bits (not documented in RFC):
+            lengths = (self._aad_len * 8).to_bytes(8, 'big') \
+                    + (self._text_len * 8).to_bytes(8, 'big')
+            # the text is padded with zeros to full block, too
+            self._y = self.gcm.ghash_update(self._y, self._pending)
+            self._y = self.gcm.ghash_update(self._y, lengths)
+            self._pending = b''
+            self._tag = self.gcm.gctr(self._iv, self._y.to_bytes(16, 'big'))
+        return self._tag
+
+    def verify(self, tag: bytes) -> None:
+        """Finish decryption and check the received authentication tag
+
+        Raises
+        ------
+        ValueError
+            Authentication tag does not match
+        """
+        if not constant_time_equal(self.finalize(), tag):
+            raise ValueError('Authentication tag mismatch')
+
+    def _hash(self, data: bytes) -> None:
+        data = self._pending + data
+        full = len(data) & ~15
+        self._y = self.gcm.ghash_update(self._y, data[:full])
+        self._pending = data[full:]
+
+    def _close_aad(self) -> None:
+        # AAD is padded with zeros to full block
+        self._y = self.gcm.ghash_update(self._y, self._pending)
+        self._pending = b''
+        self._aad_done = True
+
+
+# ---- GHASH multiplication tables ----
+#
+# Field elements are 128-bit integers, the most significant bit is the
+# coefficient of x^0 (the "reverse" bit order of GCM). Multiplication by x is
+# a right shift, the bit shifted out (x^128) is reduced by R.
+#
+# Shoup's method: M[b] = b*H for every b of `bits` bits at the x^0 end of the
+# element. The product is calculated chunk by chunk with Horner's method,
+# starting with the chunk of highest degree:
+#     Z = Z * x^bits + M[chunk]
+# Z * x^bits shifts out `bits` bits, their reduction is looked up in table RT.
+
+_R = 0xe1 << 120
+
+def _mul_x(v: int) -> int:
+    return v >> 1 ^ _R if v & 1 else v >> 1
+
+def _table_multiplier(h: int, bits: int):
+    size = 1 << bits
+    # M[b] for single bits, then every combination by linearity
+    M = [0] * size
+    v = h
+    bit = size >> 1
+    while bit:
+        M[bit] = v
+        v = _mul_x(v)
+        bit >>= 1
+    for b in range(1, size):
+        low = b & -b
+        M[b] = M[low] ^ M[b ^ low]
+    # RT[b]: reduction of b * x^bits
+    RT = []
+    for b in range(size):
+        for _ in range(bits):
+            b = _mul_x(b)
+        RT.append(b)
+    M = tuple(M)
+    RT = tuple(RT)
+    mask = size - 1
+
+    if bits == 8:
+        def mul_h(y: int) -> int:
+            chunks = y.to_bytes(16, 'big')
+            z = M[chunks[15]]
+            for c in chunks[14::-1]:
+                z = z >> 8 ^ RT[z & 255] ^ M[c]
+            return z
+    else:
+        def mul_h(y: int) -> int:
+            z = 0
+            for shift in range(0, 128, bits):
+                z = z >> bits ^ RT[z & mask] ^ M[y >> shift & mask]
+            return z
+    return mul_h
@@ -3,6 +3,8 @@
 from .xor import xor8
 from .sha256 import sha224, sha256
 from .sha512 import sha384, sha512
+from .sha256_unrolled import sha224_unrolled, sha256_unrolled
+from .sha512_unrolled import sha384_unrolled, sha512_unrolled
 from .hmac import hmac
 
 from .registry import Registry
@@ -1,6 +1,5 @@
 #!/usr/bin/python3
 
-import copy
 from abc import ABC, abstractmethod
 from util.function_meta import FunctionMeta
 
@@ -10,7 +9,8 @@ class HashFunctionMeta(FunctionMeta):
         metacls._create_property(cls, bases, classdict, 'block_size')
 
         classdict['hexdigest'] = lambda self: self.digest().hex()
-        classdict['copy'] = lambda self: copy.deepcopy(self)
+        if 'copy' not in classdict:
+            classdict['copy'] = metacls.func_copy
         classdict['__init__'] = metacls.func_init
 
         return super().__new__(metacls, cls, bases, classdict, **kwargs)
@@ -20,6 +20,17 @@ class HashFunctionMeta(FunctionMeta):
         if data is not None:
             self.update(data)
 
+    def func_copy(self):
+        # Cheaper than deepcopy: the state of a hash function is a few ints,
+        # byte strings and containers of ints (lists, bytearrays), or other
+        # hash function objects (e.g. hmac), so copying the attributes one
+        # level deep (using their own `copy`) is sufficient.
+        clone = object.__new__(type(self))
+        for key, value in self.__dict__.items():
+            copy = getattr(value, 'copy', None)
+            clone.__dict__[key] = value if copy is None else copy()
+        return clone
+
 
 class HashFunction(ABC, metaclass = HashFunctionMeta):
     digest_size: int = 1
@@ -19,13 +19,32 @@ class sha256(HashFunction):
         self._l = 0
         self._H = _H0[self.name].copy()
 
-    def update(self, message: bytes) -> None:
-        self._M += message
-        while len(self._M) >= 64:
-            M = self._M[:64]
-            self._M = self._M[64:]
-            self._l += 512
+    def update(self, message: bytes|bytearray|memoryview) -> None:
+        # Full blocks are processed directly from the caller's buffer (without
+        # copying), only the incomplete tail is stored in _M.
+        data = memoryview(message).cast('B')
+        size = len(data)
+        M = self._M
+        pos = 0
+        if M:
+            pos = min(64 - len(M), size)
+            M += data[:pos]
+            if len(M) < 64:
+                return
             self._H = self._compute_hash(self._H, M)
+            self._l += 512
+            M.clear()
+        end = pos + (size - pos) // 64 * 64
+        if end > pos:
+            self._H = self._process_blocks(self._H, data[pos:end])
+            self._l += (end - pos) * 8
+        M += data[end:]
+
+    def _process_blocks(self, H: list[int], data: memoryview) -> list[int]:
+        compute_hash = self._compute_hash
+        for pos in range(0, len(data), 64):
+            H = compute_hash(H, data[pos:pos+64])
+        return H
 
     def digest(self) -> bytes:
         li = len(self._M)
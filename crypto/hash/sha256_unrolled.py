@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+# According to FIPS 180-2, 6.2
+
+import struct
+from .sha256 import sha224, sha256, _H0, _K
+from .registry import Registry
+
+class sha256_unrolled(sha256):
+    """SHA-256 with an optimized compression function
+
+    Byte-identical to `sha256`, which follows the steps of the specification
+    and is easier to read. Here the helper functions are inlined, the
+    message schedule is calculated in a single pass (with the round constants
+    already added), eight rounds are unrolled so that the working variables
+    do not need to be shifted, and all blocks of an `update` are processed in
+    one call.
+
+    The rotations themselves are not masked: `x >> n | x << 32 - n` leaves
+    garbage above bit 31, which does not affect the lower bits of the xors
+    and additions. Instead, each sum is masked once, when it becomes a new
+    working variable or message schedule word (the temporary `t` is left
+    unmasked, it is masked in both sums that use it).
+    """
+    _iv: str = 'sha256'
+
+    def init(self) -> None:
+        self._M = bytearray()
+        self._l = 0
+        self._H = _H0[self._iv].copy()
+
+    def _compute_hash(self, H: list[int], M: bytearray) -> list[int]:
+        return self._process_blocks(H, M)
+
+    def _process_blocks(self, H: list[int], data: memoryview) -> list[int]:
+        K = _K
+        count = len(data) // 64 * 16
+        words = struct.unpack(f'>{count}I', data)
+        a, b, c, d, e, f, g, h = H
+        for pos in range(0, count, 16):
+            # message schedule
+            W = list(words[pos:pos+16])
+            for t in range(16, 64):
+                x = W[t - 15]
+                y = W[t - 2]
+                W.append((((y >> 17 | y << 15) ^ (y >> 19 | y << 13) ^ y >> 10) + W[t - 7]
+                    + ((x >> 7 | x << 25) ^ (x >> 18 | x << 14) ^ x >> 3) + W[t - 16]) & 0xffffffff)
+            KW = [k + w for k, w in zip(K, W)]
+            a0, b0, c0, d0, e0, f0, g0, h0 = a, b, c, d, e, f, g, h
+            for i in range(0, 64, 8):
+                t = h + ((e >> 6 | e << 26) ^ (e >> 11 | e << 21) ^ (e >> 25 | e << 7)) + (g ^ e & (f ^ g)) + KW[i]
+                d = d + t & 0xffffffff
+                h = t + ((a >> 2 | a << 30) ^ (a >> 13 | a << 19) ^ (a >> 22 | a << 10)) + (a & b | c & (a | b)) & 0xffffffff
+                t = g + ((d >> 6 | d << 26) ^ (d >> 11 | d << 21) ^ (d >> 25 | d << 7)) + (f ^ d & (e ^ f)) + KW[i+1]
+                c = c + t & 0xffffffff
+                g = t + ((h >> 2 | h << 30) ^ (h >> 13 | h << 19) ^ (h >> 22 | h << 10)) + (h & a | b & (h | a)) & 0xffffffff
+                t = f + ((c >> 6 | c << 26) ^ (c >> 11 | c << 21) ^ (c >> 25 | c << 7)) + (e ^ c & (d ^ e)) + KW[i+2]
+                b = b + t & 0xffffffff
+                f = t + ((g >> 2 | g << 30) ^ (g >> 13 | g << 19) ^ (g >> 22 | g << 10)) + (g & h | a & (g | h)) & 0xffffffff
+                t = e + ((b >> 6 | b << 26) ^ (b >> 11 | b << 21) ^ (b >> 25 | b << 7)) + (d ^ b & (c ^ d)) + KW[i+3]
+                a = a + t & 0xffffffff
+                e = t + ((f >> 2 | f << 30) ^ (f >> 13 | f << 19) ^ (f >> 22 | f << 10)) + (f & g | h & (f | g)) & 0xffffffff
+                t = d + ((a >> 6 | a << 26) ^ (a >> 11 | a << 21) ^ (a >> 25 | a << 7)) + (c ^ a & (b ^ c)) + KW[i+4]
+                h = h + t & 0xffffffff
+                d = t + ((e >> 2 | e << 30) ^ (e >> 13 | e << 19) ^ (e >> 22 | e << 10)) + (e & f | g & (e | f)) & 0xffffffff
+                t = c + ((h >> 6 | h << 26) ^ (h >> 11 | h << 21) ^ (h >> 25 | h << 7)) + (b ^ h & (a ^ b)) + KW[i+5]
+                g = g + t & 0xffffffff
+                c = t + ((d >> 2 | d << 30) ^ (d >> 13 | d << 19) ^ (d >> 22 | d << 10)) + (d & e | f & (d | e)) & 0xffffffff
+                t = b + ((g >> 6 | g << 26) ^ (g >> 11 | g << 21) ^ (g >> 25 | g << 7)) + (a ^ g & (h ^ a)) + KW[i+6]
+                f = f + t & 0xffffffff
+                b = t + ((c >> 2 | c << 30) ^ (c >> 13 | c << 19) ^ (c >> 22 | c << 10)) + (c & d | e & (c | d)) & 0xffffffff
+                t = a + ((f >> 6 | f << 26) ^ (f >> 11 | f << 21) ^ (f >> 25 | f << 7)) + (h ^ f & (g ^ h)) + KW[i+7]
+                e = e + t & 0xffffffff
+                a = t + ((b >> 2 | b << 30) ^ (b >> 13 | b << 19) ^ (b >> 22 | b << 10)) + (b & c | d & (b | c)) & 0xffffffff
+            a = a0 + a & 0xffffffff
+            b = b0 + b & 0xffffffff
+            c = c0 + c & 0xffffffff
+            d = d0 + d & 0xffffffff
+            e = e0 + e & 0xffffffff
+            f = f0 + f & 0xffffffff
+            g = g0 + g & 0xffffffff
+            h = h0 + h & 0xffffffff
+        return [a, b, c, d, e, f, g, h]
+
+
+class sha224_unrolled(sha256_unrolled):
+    digest_size: int = 28
+    _iv = 'sha224'
+
+
+Registry.add(sha224_unrolled)
+Registry.add(sha256_unrolled)
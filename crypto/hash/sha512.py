@@ -19,13 +19,32 @@ class sha512(HashFunction):
         self._l = 0
         self._H = _H0[self.name].copy()
 
-    def update(self, message: bytes) -> None:
-        self._M += message
-        while len(self._M) >= 128:
-            M = self._M[:128]
-            self._M = self._M[128:]
-            self._l += 1024
+    def update(self, message: bytes|bytearray|memoryview) -> None:
+        # Full blocks are processed directly from the caller's buffer (without
+        # copying), only the incomplete tail is stored in _M.
+        data = memoryview(message).cast('B')
+        size = len(data)
+        M = self._M
+        pos = 0
+        if M:
+            pos = min(128 - len(M), size)
+            M += data[:pos]
+            if len(M) < 128:
+                return
             self._H = self._compute_hash(self._H, M)
+            self._l += 1024
+            M.clear()
+        end = pos + (size - pos) // 128 * 128
+        if end > pos:
+            self._H = self._process_blocks(self._H, data[pos:end])
+            self._l += (end - pos) * 8
+        M += data[end:]
+
+    def _process_blocks(self, H: list[int], data: memoryview) -> list[int]:
+        compute_hash = self._compute_hash
+        for pos in range(0, len(data), 128):
+            H = compute_hash(H, data[pos:pos+128])
+        return H
 
     def digest(self) -> bytes:
         li = len(self._M)
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+# According to FIPS 180-2, 6.3
+
+import struct
+from .sha512 import sha384, sha512, _H0, _K
+from .registry import Registry
+
+class sha512_unrolled(sha512):
+    """SHA-512 with an optimized compression function
+
+    Byte-identical to `sha512`, which follows the steps of the specification
+    and is easier to read. Here the helper functions are inlined, the
+    message schedule is calculated in a single pass (with the round constants
+    already added), eight rounds are unrolled so that the working variables
+    do not need to be shifted, and all blocks of an `update` are processed in
+    one call.
+
+    The rotations themselves are not masked: `x >> n | x << 64 - n` leaves
+    garbage above bit 63, which does not affect the lower bits of the xors
+    and additions. Instead, each sum is masked once, when it becomes a new
+    working variable or message schedule word (the temporary `t` is left
+    unmasked, it is masked in both sums that use it).
+    """
+    _iv: str = 'sha512'
+
+    def init(self) -> None:
+        self._M = bytearray()
+        self._l = 0
+        self._H = _H0[self._iv].copy()
+
+    def _compute_hash(self, H: list[int], M: bytearray) -> list[int]:
+        return self._process_blocks(H, M)
+
+    def _process_blocks(self, H: list[int], data: memoryview) -> list[int]:
+        K = _K
+        count = len(data) // 128 * 16
+        words = struct.unpack(f'>{count}Q', data)
+        a, b, c, d, e, f, g, h = H
+        for pos in range(0, count, 16):
+            # message schedule
+            W = list(words[pos:pos+16])
+            for t in range(16, 80):
+                x = W[t - 15]
+                y = W[t - 2]
+                W.append((((y >> 19 | y << 45) ^ (y >> 61 | y << 3) ^ y >> 6) + W[t - 7]
+                    + ((x >> 1 | x << 63) ^ (x >> 8 | x << 56) ^ x >> 7) + W[t - 16]) & 0xffffffffffffffff)
+            KW = [k + w for k, w in zip(K, W)]
+            a0, b0, c0, d0, e0, f0, g0, h0 = a, b, c, d, e, f, g, h
+            for i in range(0, 80, 8):
+                t = h + ((e >> 14 | e << 50) ^ (e >> 18 | e << 46) ^ (e >> 41 | e << 23)) + (g ^ e & (f ^ g)) + KW[i]
+                d = d + t & 0xffffffffffffffff
+                h = t + ((a >> 28 | a << 36) ^ (a >> 34 | a << 30) ^ (a >> 39 | a << 25)) + (a & b | c & (a | b)) & 0xffffffffffffffff
+                t = g + ((d >> 14 | d << 50) ^ (d >> 18 | d << 46) ^ (d >> 41 | d << 23)) + (f ^ d & (e ^ f)) + KW[i+1]
+                c = c + t & 0xffffffffffffffff
+                g = t + ((h >> 28 | h << 36) ^ (h >> 34 | h << 30) ^ (h >> 39 | h << 25)) + (h & a | b & (h | a)) & 0xffffffffffffffff
+                t = f + ((c >> 14 | c << 50) ^ (c >> 18 | c << 46) ^ (c >> 41 | c << 23)) + (e ^ c & (d ^ e)) + KW[i+2]
+                b = b + t & 0xffffffffffffffff
+                f = t + ((g >> 28 | g << 36) ^ (g >> 34 | g << 30) ^ (g >> 39 | g << 25)) + (g & h | a & (g | h)) & 0xffffffffffffffff
+                t = e + ((b >> 14 | b << 50) ^ (b >> 18 | b << 46) ^ (b >> 41 | b << 23)) + (d ^ b & (c ^ d)) + KW[i+3]
+                a = a + t & 0xffffffffffffffff
+                e = t + ((f >> 28 | f << 36) ^ (f >> 34 | f << 30) ^ (f >> 39 | f << 25)) + (f & g | h & (f | g)) & 0xffffffffffffffff
+                t = d + ((a >> 14 | a << 50) ^ (a >> 18 | a << 46) ^ (a >> 41 | a << 23)) + (c ^ a & (b ^ c)) + KW[i+4]
+                h = h + t & 0xffffffffffffffff
+                d = t + ((e >> 28 | e << 36) ^ (e >> 34 | e << 30) ^ (e >> 39 | e << 25)) + (e & f | g & (e | f)) & 0xffffffffffffffff
+                t = c + ((h >> 14 | h << 50) ^ (h >> 18 | h << 46) ^ (h >> 41 | h << 23)) + (b ^ h & (a ^ b)) + KW[i+5]
+                g = g + t & 0xffffffffffffffff
+                c = t + ((d >> 28 | d << 36) ^ (d >> 34 | d << 30) ^ (d >> 39 | d << 25)) + (d & e | f & (d | e)) & 0xffffffffffffffff
+                t = b + ((g >> 14 | g << 50) ^ (g >> 18 | g << 46) ^ (g >> 41 | g << 23)) + (a ^ g & (h ^ a)) + KW[i+6]
+                f = f + t & 0xffffffffffffffff
+                b = t + ((c >> 28 | c << 36) ^ (c >> 34 | c << 30) ^ (c >> 39 | c << 25)) + (c & d | e & (c | d)) & 0xffffffffffffffff
+                t = a + ((f >> 14 | f << 50) ^ (f >> 18 | f << 46) ^ (f >> 41 | f << 23)) + (h ^ f & (g ^ h)) + KW[i+7]
+                e = e + t & 0xffffffffffffffff
+                a = t + ((b >> 28 | b << 36) ^ (b >> 34 | b << 30) ^ (b >> 39 | b << 25)) + (b & c | d & (b | c)) & 0xffffffffffffffff
+            a = a0 + a & 0xffffffffffffffff
+            b = b0 + b & 0xffffffffffffffff
+            c = c0 + c & 0xffffffffffffffff
+            d = d0 + d & 0xffffffffffffffff
+            e = e0 + e & 0xffffffffffffffff
+            f = f0 + f & 0xffffffffffffffff
+            g = g0 + g & 0xffffffffffffffff
+            h = h0 + h & 0xffffffffffffffff
+        return [a, b, c, d, e, f, g, h]
+
+
+class sha384_unrolled(sha512_unrolled):
+    digest_size: int = 48
+    _iv = 'sha384'
+
+
+Registry.add(sha384_unrolled)
+Registry.add(sha512_unrolled)
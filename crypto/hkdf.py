@@ -2,19 +2,37 @@
 # RFC5869
 
 from .hash import hmac
+from .transcripthash import TranscriptHash
+import collections
 import struct
 from typing import Callable
 
 class HKDF:
     hash_function: Callable
     hash_size: int
+    # Number of keys with prepared (keyed) hmac objects kept
+    key_cache_size: int = 16
 
     def __init__(self, hash_function: Callable|str):
         self.hash_function = hash_function
         self.hash_size = self.hash_function().digest_size
+        self._keys: collections.OrderedDict[bytes, hmac] = collections.OrderedDict()
 
     def hmac_hash(self, key: bytes, data: bytes) -> bytes:
-        return hmac(data, key=key, hash_function=self.hash_function).digest()
+        # The same few secrets are used many times during a handshake. A
+        # prepared hmac object has the inner and outer key blocks already
+        # hashed; it is only copied for each message.
+        prepared = self._keys.get(key)
+        if prepared is None:
+            prepared = hmac(key=key, hash_function=self.hash_function)
+            self._keys[key] = prepared
+            if len(self._keys) > self.key_cache_size:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+        h = prepared.copy()
+        h.update(data)
+        return h.digest()
 
     def extract(self, salt: bytes|None, ikm: bytes) -> bytes:
         if salt is None:
@@ -39,7 +57,13 @@ class HKDF:
             + bytes([len(context)]) + context
         return self.expand(secret, hkdf_label, length)
 
-    def derive_secret(self, secret: bytes, label: str, messages: list[bytes]) -> bytes:
+    def derive_secret(self, secret: bytes, label: str,
+            messages: list[bytes]|TranscriptHash) -> bytes:
         # RFC8446 7.1
-        transcript_hash = self.hash_function(b''.join(messages)).digest()
+        # `messages` may also be a running hash of the messages, so that they
+        # need not be hashed again.
+        if isinstance(messages, TranscriptHash):
+            transcript_hash = messages.digest()
+        else:
+            transcript_hash = self.hash_function(b''.join(messages)).digest()
         return self.expand_label(secret, label, transcript_hash, self.hash_size)
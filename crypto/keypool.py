@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+
+import collections
+import threading
+from .ecdh import ECDH
+from .ffdh import FFDH
+from .groupinfo import GROUP_INFO_BY_ID, FFDHGroup
+
+_pools: dict[int, 'KeySharePool'] = {}
+_lock = threading.Lock()
+
+class KeySharePool:
+    """Pre-generated ephemeral key pairs of a key exchange group
+
+    A background thread keeps the pool filled, so that a connection can take a
+    ready (private, public) pair instead of generating one. Every pair is
+    handed out exactly once. If the pool is empty, the pair is generated on
+    the spot (a miss).
+
+    Whenever the number of ready pairs falls to `low_watermark` or below, the
+    worker refills the pool up to `size`. Both values can be changed at any
+    time. The worker is started by `start` or the first `get`.
+
+    Note, that the worker is a Python thread, so it does not generate keys in
+    parallel with other Python code; it uses the idle time between
+    connections.
+
+    Parameters
+    ----------
+    key_manager : ECDH or FFDH like
+        Object with a `generate_key_pair()` method
+    size : int, default=8
+        Number of pairs kept ready (high watermark)
+    low_watermark : int, default=2
+        Refill is started at this number of ready pairs
+    """
+    def __init__(self, key_manager, *, size: int = 8, low_watermark: int = 2):
+        if not 0 <= low_watermark < size:
+            raise ValueError('Invalid pool watermarks')
+        self.key_manager = key_manager
+        self.size = size
+        self.low_watermark = low_watermark
+        self.hits = 0
+        self.misses = 0
+        self._pairs = collections.deque()
+        self._cond = threading.Condition()
+        self._worker = None
+        self._stopped = False
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def get(self) -> tuple:
+        """Take a fresh (private, public) key pair"""
+        self.start()
+        with self._cond:
+            pair = self._pairs.popleft() if self._pairs else None
+            if pair is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            if len(self._pairs) <= self.low_watermark:
+                self._cond.notify()
+        if pair is None:
+            pair = self.key_manager.generate_key_pair()
+        return pair
+
+    def start(self) -> None:
+        """Start the worker thread (if not running yet)"""
+        with self._cond:
+            if self._worker is None and not self._stopped:
+                self._worker = threading.Thread(target=self._run,
+                    name=f'KeySharePool-{self.key_manager.group.idstr}',
+                    daemon=True)
+                self._worker.start()
+
+    def stop(self) -> None:
+        """Stop the worker thread and drop the ready pairs"""
+        with self._cond:
+            self._stopped = True
+            self._pairs.clear()
+            self._cond.notify()
+        if self._worker is not None:
+            self._worker.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped and len(self._pairs) > self.low_watermark:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+            while len(self._pairs) < self.size and not self._stopped:
+                pair = self.key_manager.generate_key_pair()
+                with self._cond:
+                    if not self._stopped:
+                        self._pairs.append(pair)
+
+
+def key_share_pool(group_id: int) -> KeySharePool:
+    """Shared key pair pool of a group (created on first use)
+
+    Parameters
+    ----------
+    group_id : int
+        Key of the group in `GROUP_INFO_BY_ID`
+    """
+    with _lock:
+        pool = _pools.get(group_id)
+        if pool is None:
+            group = GROUP_INFO_BY_ID[group_id]
+            if isinstance(group, FFDHGroup):
+                key_manager = FFDH(group)
+            else:
+                key_manager = ECDH(group)
+            pool = _pools[group_id] = KeySharePool(key_manager)
+    return pool
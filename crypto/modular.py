@@ -1,10 +1,17 @@
 #!/usr/bin/python3
 
-from functools import total_ordering
+from functools import cache, total_ordering
 
-@total_ordering
+@cache
 def Modular(p: int):
+    """Class of the integers modulo p
+
+    The class is created only once per modulus, later calls return the same
+    class.
+    """
+    @total_ordering
     class _M:
+        __slots__ = ('value',)
         p: int
         value: int
         def __init__(self, value):
@@ -48,12 +55,50 @@ def Modular(p: int):
         def __rmul__(self, lhs: int):
             return _M(lhs * self.value % _M.p)
 
+        # In-place operators modify the object instead of creating a new one
+
+        def __iadd__(self, rhs):
+            self.value = (self.value + rhs.value) % _M.p
+            return self
+
+        def __isub__(self, rhs):
+            self.value = (self.value - rhs.value) % _M.p
+            return self
+
+        def __imul__(self, rhs):
+            self.value = self.value * rhs.value % _M.p
+            return self
+
         def _inverse(self):
             return pow(self.value, -1, _M.p)
 
         def inverse(self):
             return _M(self._inverse())
 
+        @staticmethod
+        def batch_inverse(values) -> list:
+            """Inverses of several values with a single modular inversion
+
+            Montgomery's trick: the inverse of the product of all values is
+            calculated, and the individual inverses are recovered from it and
+            the prefix products, using 3(n-1) multiplications.
+
+            Raises ValueError, if any of the values is not invertible.
+            """
+            m: int = _M.p
+            values = [int(v) % m for v in values]
+            prefix = []
+            acc = 1
+            for v in values:
+                prefix.append(acc)
+                acc = acc * v % m
+            inv = pow(acc, -1, m)
+            result = [None] * len(values)
+            for i in range(len(values) - 1, -1, -1):
+                result[i] = _M(inv * prefix[i] % m)
+                inv = inv * values[i] % m
+            return result
+
         def __truediv__(self, rhs):
             return _M(self.value * rhs._inverse() % _M.p)
 
@@ -64,52 +109,82 @@ def Modular(p: int):
             return _M(pow(self.value, rhs, _M.p))
 
         def sqrt(self):
+            """Square roots (sorted), empty list if there is none"""
+            return _M._sqrt(self.value % _M.p)
+
+        @staticmethod
+        def sqrt_many(values) -> list:
+            """Square roots of several values, e.g. to decompress many points
+
+            Same as `[_M(v).sqrt() for v in values]`, but the Tonelli-Shanks
+            constants of the prime are looked up only once, before the loop.
+            """
+            m = _M.p
+            sqrt = _M._sqrt
+            constants = _M._tonelli_shanks_constants() if m % 8 == 1 else None
+            return [sqrt(int(v) % m, constants) for v in values]
+
+        @staticmethod
+        def _sqrt(a: int, constants: tuple[int, int, int]|None = None) -> list:
             # ref: https://www.rieselprime.de/ziki/Modular_square_root
-            if self.value == 0:
+            if a == 0:
                 return [_M(0)]
-            m: int = self.p
-            a = _M(self.value)
-            x = a ** (m - 1 >> 1)
-            if x != 1:
-                return []
+            m: int = _M.p
             if m % 4 == 3:
-                c = a ** (m + 1 >> 2)
+                # checking the result is cheaper than Euler's criterion
+                c = pow(a, m + 1 >> 2, m)
+                if c * c % m != a:
+                    return []
             elif m % 8 == 5:
-                v = (2 * a) ** (m - 5 >> 3)
-                i = 2 * a * v * v
-                c = a * v * (i - _M(1))
-            elif m % 8 == 1:
-                # step 1:
-                e: int = 0
-                q: int = m - 1
-                while (q & 1) == 0:
-                    e += 1
-                    q >>= 1
-                # step 2:
-                for x in range(2, m):
-                    z = _M(x) ** q
-                    t = z ** (1 << e - 1)
-                    if t != 1:
-                        break
+                v = pow(2 * a, m - 5 >> 3, m)
+                i = 2 * a * v * v % m
+                c = a * v * (i - 1) % m
+                if c * c % m != a:
+                    return []
+            else:
+                if pow(a, m - 1 >> 1, m) != 1:
+                    return []
+                # steps 1-2: cached per prime
+                e, q, z = constants or _M._tonelli_shanks_constants()
                 # step 3:
                 y = z
                 r: int = e
-                x = a ** (q - 1 >> 1)
-                v = a * x
-                w = v * x
+                x = pow(a, q - 1 >> 1, m)
+                v = a * x % m
+                w = v * x % m
                 # step 4:
                 while w != 1:
                     # step 5:
                     k: int = 0
-                    while w ** (1<<k) != 1:
+                    t = w
+                    while t != 1:
+                        t = t * t % m
                         k += 1
                     # step 6:
-                    d = y ** (1 << r - k - 1)
-                    y = d * d
+                    d = pow(y, 1 << r - k - 1, m)
+                    y = d * d % m
                     r = k
-                    v = d * v
-                    w = w * y
+                    v = d * v % m
+                    w = w * y % m
                 c = v
-            return sorted([c, -c])
+            return sorted([_M(c), _M(-c % m)])
+
+        @staticmethod
+        def _tonelli_shanks_constants() -> tuple[int, int, int]:
+            # p - 1 = q * 2^e (q odd), z = n^q for a quadratic non-residue n
+            if _M._ts_constants is None:
+                m = _M.p
+                e: int = 0
+                q: int = m - 1
+                while (q & 1) == 0:
+                    e += 1
+                    q >>= 1
+                n = 2
+                while pow(n, m - 1 >> 1, m) != m - 1:
+                    n += 1
+                _M._ts_constants = (e, q, pow(n, q, m))
+            return _M._ts_constants
+
     _M.p = p
+    _M._ts_constants = None
     return _M
@@ -2,12 +2,38 @@
 
 from functools import total_ordering
 
+_METHODS = ('bitwise', 'window', 'log')
+
 @total_ordering
-def Polynomial(q: int|list[int], *, reverse = False):
+def Polynomial(q: int|list[int], *, reverse = False, method: str = 'bitwise'):
+    """Create class of GF(2^n) elements
+
+    Parameters
+    ----------
+    q : int or list of int
+        Field (reduction) polynomial, either as an integer, or as the list of
+        the exponents of its terms
+    reverse : bool, default=False
+        Reverse bit order: the most significant bit is the coefficient of x^0
+        (e.g. GCM)
+    method : str, default='bitwise'
+        Multiplication method:
+
+        - 'bitwise': shift-and-add, one bit of the multiplier in each step
+        - 'window': 4 bits of the multiplier in each step, using a table of
+          the multiples of the multiplicand, and a precomputed reduction
+          table of the field. It pays off for large fields (e.g. 2^128).
+        - 'log': logarithm/antilogarithm tables; only for small fields (up to
+          2^16 elements). Inversion becomes a table lookup, too.
+    """
+    if method not in _METHODS:
+        raise ValueError(f"Unknown multiplication method '{method}'")
+
     class _P:
         value: int
         degree: int
         reverse: bool
+        method: str
         q: int
         mask: int
         def __init__(self, value):
@@ -77,17 +103,32 @@ def Polynomial(q: int|list[int], *, reverse = False):
             return _P(result)
 
         def __mul__(self, rhs):
+            if self.method != 'bitwise':
+                return _P(_fastmul(self.value, rhs.value))
             if self.reverse:
                 return self._revmul(rhs)
             else:
                 return self._mul(rhs)
 
+        def __imul__(self, rhs):
+            self.value = (self * rhs).value
+            return self
+
+        def __iadd__(self, rhs):
+            self.value ^= rhs.value
+            return self
+
+        __isub__ = __iadd__
+        __ixor__ = __iadd__
+
         def __rmul__(self, lhs: int):
             return _P(lhs) * self
 
         def inverse(self):
             if (self.value == 0):
                 raise ZeroDivisionError('division by zero')
+            if self.method == 'log':
+                return _P(_exp[_order - _log[self.value]])
             return self ** (self.mask - 2)
 
         def __truediv__(self, rhs):
@@ -100,6 +141,10 @@ def Polynomial(q: int|list[int], *, reverse = False):
             if rhs == 0:
                 # Note: following pythonic way, 0**0 = 1
                 return _P(1)
+            if self.method == 'log':
+                if self.value == 0:
+                    return _P(0)
+                return _P(_exp[_log[self.value] * rhs % _order])
             value1 = _P(self.value)
             value2 = rhs
             result = _P(1)
@@ -139,4 +184,127 @@ def Polynomial(q: int|list[int], *, reverse = False):
     _P.degree = degree
     _P.mask = mask
     _P.reverse = reverse
+    _P.method = method
+
+    if method != 'bitwise':
+        _fastmul = _window_multiplier(q, mask, reverse)
+    if method == 'log':
+        _exp, _log = _log_tables(_fastmul, mask, reverse)
+        _order = len(_log) - 1
+        _fastmul = _log_multiplier(_exp, _log)
     return _P
+
+
+# ---- Fast multiplication methods ----
+
+_WINDOW = 4
+
+def _window_multiplier(q: int, mask: int, reverse: bool):
+    """Create windowed multiplication function of the field
+
+    The product a*b is calculated with Horner's method over the 4-bit chunks
+    of b, starting with the chunk of highest degree:
+        z = z * x^4 + M[chunk]
+    where M[c] = c*a is calculated for all 16 chunk values at the beginning.
+    The 4 bits shifted out by z * x^4 are reduced with the precomputed table
+    RT of the field.
+    """
+    w = _WINDOW
+    wmask = (1 << w) - 1
+    if reverse:
+        n = mask.bit_length()
+        def mul_x(v: int) -> int:
+            return (v ^ q) >> 1 if v & 1 else v >> 1
+        # chunk bits: LSB is the coefficient of the highest degree
+        units = [1 << t for t in range(w - 1, -1, -1)]
+        RT = [0] * (1 << w)
+        for c in range(1 << w):
+            v = c
+            for _ in range(w):
+                v = mul_x(v)
+            RT[c] = v
+        pad = -n % w
+        shifts = range(0, n + pad, w)
+    else:
+        n = mask.bit_length() - 1
+        def mul_x(v: int) -> int:
+            v <<= 1
+            return v ^ q if v & mask else v
+        units = [1 << t for t in range(w)]
+        RT = [0] * (1 << w)
+        for c in range(1 << w):
+            v = c << n - w
+            for _ in range(w):
+                v = mul_x(v)
+            RT[c] = v
+        pad = 0
+        shifts = range((n - 1) // w * w, -1, -w)
+    lowmask = (1 << n - w) - 1
+    RT = tuple(RT)
+
+    def multiples(a: int) -> list[int]:
+        M = [0] * (1 << w)
+        for unit in units:
+            M[unit] = a
+            a = mul_x(a)
+        for c in range(3, 1 << w):
+            low = c & -c
+            if c != low:
+                M[c] = M[low] ^ M[c ^ low]
+        return M
+
+    if reverse:
+        def mul(a: int, b: int) -> int:
+            M = multiples(a)
+            b <<= pad
+            z = 0
+            for shift in shifts:
+                z = z >> w ^ RT[z & wmask] ^ M[b >> shift & wmask]
+            return z
+    else:
+        def mul(a: int, b: int) -> int:
+            M = multiples(a)
+            z = 0
+            for shift in shifts:
+                z = (z & lowmask) << w ^ RT[z >> n - w] ^ M[b >> shift & wmask]
+            return z
+    return mul
+
+def _log_tables(mul, mask: int, reverse: bool) -> tuple[list[int], list[int]]:
+    """Create exponential (antilogarithm) and logarithm tables
+
+    The smallest generator of the multiplicative group is used as base. The
+    exponential table is doubled, so that exp[log[a] + log[b]] needs no
+    modulo operation.
+    """
+    if reverse:
+        n = mask.bit_length()
+        one = 1 << n - 1
+    else:
+        n = mask.bit_length() - 1
+        one = 1
+    if n > 16:
+        raise ValueError('Log tables are only supported for fields up to 2^16')
+    size = 1 << n
+    order = size - 1
+    for g in range(2, size):
+        exp = [one]
+        v = g
+        while v != one and len(exp) <= order:
+            exp.append(v)
+            v = mul(v, g)
+        if len(exp) == order:
+            break
+    else:
+        raise ValueError('Field polynomial is not irreducible')
+    log = [0] * size
+    for i, v in enumerate(exp):
+        log[v] = i
+    return exp + exp, log
+
+def _log_multiplier(exp: list[int], log: list[int]):
+    def mul(a: int, b: int) -> int:
+        if a == 0 or b == 0:
+            return 0
+        return exp[log[a] + log[b]]
+    return mul
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+# RFC8446 4.4.1 (The Transcript Hash)
+
+from typing import Callable
+
+class TranscriptHash:
+    """Running hash of the handshake messages of a connection
+
+    Every handshake message is hashed exactly once, when it is added by
+    `update`. The key schedule needs the hash of different prefixes of the
+    transcript; these are taken by `digest` (which does not finish the
+    running hash) or by `copy`, which forks an independent snapshot.
+
+    The hash function is determined by the cipher suite, which is known only
+    after `server_hello`. Messages added before `set_hash_function` is called
+    (i.e. `client_hello`) are kept, and hashed when the function is set.
+
+    Parameters
+    ----------
+    hash_function : function like, optional
+        Hash function of the negotiated cipher suite
+    """
+    def __init__(self, hash_function: Callable|None = None):
+        self.hash_function = None
+        self._hash = None
+        self._pending: list[bytes] = []
+        if hash_function is not None:
+            self.set_hash_function(hash_function)
+
+    def set_hash_function(self, hash_function: Callable) -> None:
+        if self.hash_function is not None:
+            raise ValueError('Transcript hash function already set')
+        self.hash_function = hash_function
+        self._hash = hash_function()
+        for message in self._pending:
+            self._hash.update(message)
+        self._pending = []
+
+    def update(self, message: bytes) -> None:
+        """Add a handshake message (without the 5 byte record header)"""
+        if self._hash is None:
+            self._pending.append(message)
+        else:
+            self._hash.update(message)
+
+    def digest(self) -> bytes:
+        """Transcript-Hash of the messages added so far"""
+        if self._hash is None:
+            raise ValueError('Transcript hash function not set')
+        return self._hash.digest()
+
+    def copy(self) -> 'TranscriptHash':
+        clone = TranscriptHash()
+        clone.hash_function = self.hash_function
+        clone._hash = None if self._hash is None else self._hash.copy()
+        clone._pending = self._pending.copy()
+        return clone
@@ -1,6 +1,9 @@
 #!/usr/bin/python3
 
+import multiprocessing
+import os
 import sys
+import time
 from crypto.rsa import Rsa
 from util.asn1 import *
 from util.pem import *
@@ -8,7 +11,13 @@ from util.pem import *
 def fail(errstr: str|None = None):
     if errstr is not None:
         print(errstr, file=sys.stderr)
-    print(f"Usage: {sys.argv[0]} [TYPE] [PARAM]", file=sys.stderr)
+    print(f"Usage: {sys.argv[0]} [OPTIONS] [TYPE] [PARAM]", file=sys.stderr)
+    print("Options:", file=sys.stderr)
+    print("  --count N      Generate N keys (requires --out-dir)", file=sys.stderr)
+    print("  --out-dir DIR  Write keys into DIR/key-NNNNNN.pem (existing files are kept)",
+        file=sys.stderr)
+    print("  --jobs N       Number of worker processes (default: number of CPUs)",
+        file=sys.stderr)
     sys.exit(errstr is not None)
 
 def create_rsa_key(size: int):
@@ -31,21 +40,82 @@ def create_rsa_key(size: int):
     pem_text = Pem.create('RSA PRIVATE KEY', ber_content)
     return pem_text
 
+def create_key(key: tuple[str, int]) -> str:
+    key_type, key_param = key
+    if key_type == 'rsa':
+        return create_rsa_key(key_param)
+
+def write_key(out_dir: str, index: int, key: str) -> int:
+    # private keys: readable only by the owner, existing files are never
+    # overwritten (the next free index is used instead)
+    while True:
+        path = os.path.join(out_dir, f'key-{index:06d}.pem')
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            break
+        except FileExistsError:
+            index += 1
+    with os.fdopen(fd, 'w') as f:
+        f.write(key)
+    return index
+
+def create_keys(key_type: str, key_param: int, count: int, out_dir: str,
+        jobs: int) -> None:
+    os.makedirs(out_dir, mode=0o700, exist_ok=True)
+    start = time.perf_counter()
+    with multiprocessing.Pool(jobs) as pool:
+        # every key is written as soon as it is ready
+        keys = pool.imap_unordered(create_key, [(key_type, key_param)] * count)
+        index = 0
+        for key in keys:
+            index = write_key(out_dir, index + 1, key)
+    elapsed = time.perf_counter() - start
+    print(f"{count} keys in {elapsed:.2f} s ({count / elapsed:.2f} keys/s)",
+        file=sys.stderr)
+
 def main():
     key_type = 'rsa'
     key_param = 2048
-    if len(sys.argv) >= 2:
-        if sys.argv[1] in ('-h', '--help'):
+    count = None
+    out_dir = None
+    jobs = os.cpu_count()
+    argv = sys.argv[1:]
+    params = []
+    while argv:
+        arg = argv.pop(0)
+        if arg in ('-h', '--help'):
             fail()
-        key_type = sys.argv[1]
+        if arg in ('--count', '--out-dir', '--jobs'):
+            if not argv:
+                fail(f"Missing value of {arg}")
+            value = argv.pop(0)
+            if arg == '--out-dir':
+                out_dir = value
+            elif not value.isdigit() or int(value) < 1:
+                fail(f"Invalid value of {arg}")
+            elif arg == '--count':
+                count = int(value)
+            else:
+                jobs = int(value)
+        else:
+            params.append(arg)
+    if len(params) >= 1:
+        key_type = params[0]
         if key_type == 'rsa':
             key_param = 2048
         else:
             fail("Key type not supported")
-    if len(sys.argv) >= 3:
-        key_param = int(sys.argv[2])
-    if key_type == 'rsa':
-        key = create_rsa_key(key_param)
+    if len(params) >= 2:
+        key_param = int(params[1])
+    if len(params) > 2:
+        fail("Too many arguments")
+    if (count is None) != (out_dir is None):
+        fail("--count and --out-dir must be used together")
+    if count is not None:
+        create_keys(key_type, key_param, count, out_dir, jobs)
+        return
+    key = create_key((key_type, key_param))
     print(key, end='')
 
-main()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+
+import pytest
+from crypto.cipher import aes, aes_ttable, Registry
+
+# FIPS 197 Appendix C, Example Vectors
+TEST_VECTORS = ('key,plain_text,cipher_text', (
+    (   '000102030405060708090a0b0c0d0e0f', # C.1 AES-128
+        '00112233445566778899aabbccddeeff',
+        '69c4e0d86a7b0430d8cdb78070b4c55a'   ),
+    (   '000102030405060708090a0b0c0d0e0f1011121314151617', # C.2 AES-192
+        '00112233445566778899aabbccddeeff',
+        'dda97ca4864cdfe06eaf70a0ec0d7191'   ),
+    (   '000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f', # C.3 AES-256
+        '00112233445566778899aabbccddeeff',
+        '8ea2b7ca516745bfeafc49904b496089'   ),
+))
+
+ENGINES = ('engine', (aes, aes_ttable))
+
+@pytest.mark.parametrize(*ENGINES)
+@pytest.mark.parametrize(*TEST_VECTORS)
+def test_encryption(engine, key, plain_text, cipher_text):
+    cipher = engine(bytes.fromhex(key))
+    assert cipher.encrypt(bytes.fromhex(plain_text)).hex() == cipher_text
+
+@pytest.mark.parametrize(*ENGINES)
+@pytest.mark.parametrize(*TEST_VECTORS)
+def test_decryption(engine, key, plain_text, cipher_text):
+    cipher = engine(bytes.fromhex(key))
+    assert cipher.decrypt(bytes.fromhex(cipher_text)).hex() == plain_text
+
+@pytest.mark.parametrize('name', ('aes', 'aes_ttable'))
+def test_registry(name):
+    assert Registry.get(name) is not None
+
+@pytest.mark.parametrize(*ENGINES)
+def test_encrypt_blocks(engine):
+    cipher = engine(bytes(range(16)))
+    data = bytes(range(64))
+    expected = b''.join(cipher.encrypt(data[pos:pos+16]) for pos in range(0, 64, 16))
+    assert cipher.encrypt_blocks(data) == expected
+    with pytest.raises(ValueError):
+        cipher.encrypt_blocks(data[:-1])
+
+@pytest.mark.parametrize(*ENGINES)
+def test_ctr_keystream(engine):
+    cipher = engine(bytes(range(16)))
+    icb = (1 << 128) - 2 # counter wraps around
+    expected = b''.join(cipher.encrypt((cb & (1 << 128) - 1).to_bytes(16, 'big'))
+                                            for cb in range(icb, icb + 4))
+    assert cipher.ctr_keystream(icb, 4) == expected
+    assert cipher.ctr_keystream(icb, 0) == b''
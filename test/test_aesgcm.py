@@ -1,8 +1,8 @@
 #!/usr/bin/python3
 
 import pytest
-from crypto.cipher.aes import aes as AES
-from crypto import GCM
+from crypto.cipher import aes, aes_ttable
+from crypto import GCM, AES_GCM
 
 # David A. McGrew, John Viega: The Galois/Counter Mode of Operation (GCM)
 # Appendix B, AES Test Vectors
@@ -121,8 +121,11 @@ TEST_VECTORS = ('key,plain_text,auth_data,iv,cipher_text,auth_tag', (
         'a44a8266ee1c8eb0c8b5d4cf5ae9f19a'   ),
 ))
 
+ENGINES = ('AES', (aes, aes_ttable))
+
+@pytest.mark.parametrize(*ENGINES)
 @pytest.mark.parametrize(*TEST_VECTORS)
-def test_encryption(key,plain_text,auth_data,iv,cipher_text,auth_tag):
+def test_encryption(AES,key,plain_text,auth_data,iv,cipher_text,auth_tag):
     key = bytes.fromhex(key)
     iv = bytes.fromhex(iv)
     plain_text = bytes.fromhex(plain_text)
@@ -136,8 +139,9 @@ def test_encryption(key,plain_text,auth_data,iv,cipher_text,auth_tag):
     assert chk_cipher_text == cipher_text
     assert chk_auth_tag == auth_tag
 
+@pytest.mark.parametrize(*ENGINES)
 @pytest.mark.parametrize(*TEST_VECTORS)
-def test_decryption(key,plain_text,auth_data,iv,cipher_text,auth_tag):
+def test_decryption(AES,key,plain_text,auth_data,iv,cipher_text,auth_tag):
     key = bytes.fromhex(key)
     iv = bytes.fromhex(iv)
     plain_text = bytes.fromhex(plain_text)
@@ -150,3 +154,86 @@ def test_decryption(key,plain_text,auth_data,iv,cipher_text,auth_tag):
     chk_plain_text, chk_auth_tag = enc.decrypt(cipher_text, auth_data, iv)
     assert chk_plain_text == plain_text
     assert chk_auth_tag == auth_tag
+
+@pytest.mark.parametrize('table_bits', (4, 8))
+def test_ghash_tables(table_bits):
+    aes = aes_ttable(bytes.fromhex('feffe9928665731c6d6a8f9467308308'))
+    reference = GCM(aes, table_bits=None)
+    enc = GCM(aes, table_bits=table_bits)
+    data = bytes(range(256)) * 3 + b'\xff' * 5
+    assert enc.ghash(data) == reference.ghash(data)
+
+def test_ghash_invalid_table():
+    with pytest.raises(ValueError):
+        GCM(aes_ttable(bytes(16)), table_bits=6)
+
+def test_aead_key_update():
+    key1 = bytes(range(16))
+    key2 = bytes(range(16, 32))
+    nonce = bytes(range(12))
+    aead = AES_GCM()
+    aead.set_my_key(key1)
+    aead.set_my_nonce(nonce)
+    aead.set_peer_key(key1)
+    aead.set_peer_nonce(nonce)
+    cipher_text, auth_tag = aead.encrypt(b'record 0', b'head')
+    assert (cipher_text, auth_tag) == GCM(aes(key1)).encrypt(b'record 0', b'head', nonce)
+    assert aead.decrypt(cipher_text, b'head') == (b'record 0', auth_tag)
+    with pytest.raises(ValueError):
+        aead.decrypt_and_verify(cipher_text, b'head', bytes(16))
+    assert aead.peer_rec_seq_num == 1
+    # the key update replaces the prepared context
+    aead.set_my_key(key2)
+    aead.set_my_nonce(nonce)
+    assert aead.encrypt(b'record 0', b'head') \
+        == GCM(aes(key2)).encrypt(b'record 0', b'head', nonce)
+
+@pytest.mark.parametrize('chunk_size', (1, 7, 16, 33))
+@pytest.mark.parametrize(*TEST_VECTORS)
+def test_stream(chunk_size,key,plain_text,auth_data,iv,cipher_text,auth_tag):
+    key = bytes.fromhex(key)
+    iv = bytes.fromhex(iv)
+    plain_text = bytes.fromhex(plain_text)
+    auth_data = bytes.fromhex(auth_data)
+    cipher_text = bytes.fromhex(cipher_text)
+    auth_tag = bytes.fromhex(auth_tag)
+
+    enc = GCM(aes_ttable(key))
+    chunks = lambda data: (data[pos:pos+chunk_size] for pos in range(0, len(data), chunk_size))
+
+    stream = enc.stream(iv)
+    for chunk in chunks(auth_data):
+        stream.update_aad(chunk)
+    assert b''.join(stream.update(chunk) for chunk in chunks(plain_text)) == cipher_text
+    assert stream.finalize() == auth_tag
+
+    stream = enc.stream(iv, decrypt=True)
+    for chunk in chunks(auth_data):
+        stream.update_aad(chunk)
+    assert b''.join(stream.update(chunk) for chunk in chunks(cipher_text)) == plain_text
+    stream.verify(auth_tag)
+
+def test_stream_errors():
+    stream = GCM(aes_ttable(bytes(16))).stream(bytes(12), decrypt=True)
+    stream.update(b'text')
+    with pytest.raises(ValueError):
+        stream.update_aad(b'late')
+    with pytest.raises(ValueError):
+        stream.verify(bytes(16))
+    with pytest.raises(ValueError):
+        stream.update(b'more')
+
+@pytest.mark.parametrize(*TEST_VECTORS)
+def test_decrypt_and_verify(key,plain_text,auth_data,iv,cipher_text,auth_tag):
+    key = bytes.fromhex(key)
+    iv = bytes.fromhex(iv)
+    plain_text = bytes.fromhex(plain_text)
+    auth_data = bytes.fromhex(auth_data)
+    cipher_text = bytes.fromhex(cipher_text)
+    auth_tag = bytes.fromhex(auth_tag)
+
+    enc = GCM(aes_ttable(key))
+    assert enc.decrypt_and_verify(cipher_text, auth_data, iv, auth_tag) == plain_text
+    forged_tag = auth_tag[:-1] + bytes([auth_tag[-1] ^ 1])
+    with pytest.raises(ValueError):
+        enc.decrypt_and_verify(cipher_text, auth_data, iv, forged_tag)
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+
+import json
+import pytest
+from crypto import ec, fixedbase
+from crypto.ecdh import ECDH
+from crypto.groupinfo import GROUP_INFO_BY_STR
+
+# RFC 7748, 5.2 Test Vectors
+TEST_VECTORS = ('group,scalar,u,result', (
+    (   'x25519',
+        'a546e36bf0527c9d3b16154b82465edd62144c0ac1fc5a18506a2244ba449ac4',
+        'e6db6867583030db3594c1a424b15f7c726624ec26b3353b10a903a6d0ab1c4c',
+        'c3da55379de9c6908e94ea4df28d084f32eccf03491c71f754b4075577a28552'),
+    (   'x25519',
+        '4b66e9d4d1b4673c5ad22691957d6af5c11b6421e0ea01d42ca4169e7918ba0d',
+        'e5210f12786811d3f4b7959d0538ae2c31dbe7106fc03c3efc4cd549c715a493',
+        '95cbde9476e8907d7aade45cb4b873f88b595a68799fa152e6f8f7647aac7957'),
+    (   'x25519', # 1 iteration
+        '0900000000000000000000000000000000000000000000000000000000000000',
+        '0900000000000000000000000000000000000000000000000000000000000000',
+        '422c8e7a6227d7bca1350b3e2bb7279f7897b87bb6854b783c60e80311ae3079'),
+    (   'x448',
+        '3d262fddf9ec8e88495266fea19a34d28882acef045104d0d1aae121700a779c984c24f8cdd78fbff44943eba368f54b29259a4f1c600ad3',
+        '06fce640fa3487bfda5f6cf2d5263f8aad88334cbd07437f020f08f9814dc031ddbdc38c19c6da2583fa5429db94ada18aa7a7fb4ef8a086',
+        'ce3e4ff95a60dc6697da1db1d85e6afbdf79b50a2412d7546d5f239fe14fbaadeb445fc66a01b0779d98223961111e21766282f73dd96b6f'),
+    (   'x448', # 1 iteration
+        '0500000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000',
+        '0500000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000',
+        '3f482c8a9f19b01e6c46ee9711d9dc14fd4bf67af30765c2ae2b846a4d23a8cd0db897086239492caf350b51f833868b9bc2b3bca9cf4113'),
+))
+
+@pytest.mark.parametrize(*TEST_VECTORS)
+def test_montgomery(group, scalar, u, result):
+    ecdh = ECDH(GROUP_INFO_BY_STR[group])
+    assert ecdh.apply(bytes.fromhex(scalar), bytes.fromhex(u)).hex() == result
+
+@pytest.mark.parametrize('group', ('x25519', 'x448'))
+def test_montgomery_ladder(group):
+    info = GROUP_INFO_BY_STR[group]
+    curve = ec.Montgomery(A=info.A, p=info.p, bits=info.bits)
+    for k in (1 << info.bits - 1 | 8, (1 << info.bits) - 8, 3 << info.bits - 2 | 12345 << 3):
+        expected = int(k * curve(info.U_P))
+        assert ec.montgomery_ladder(k, info.U_P, A=info.A, p=info.p, bits=info.bits) == expected
+
+# With differences shifted only by 2p, these would have negative intermediate
+# values (AA - BB, DA - CB) in nearly every step of the specialised ladder
+@pytest.mark.parametrize('k, u', (
+    (0x4f17f5c4414c343c1027c4d1c386bbc4cd613e30d8f16adf91b7584a2265b1f0,
+     0x1adfcc96c9e9c616612e7696a6cecc1b78e510617311d8a3c2ce6f447ed4d57b),
+    (0x4dc0873b6ec9d28663ca828dd5f4b3b2e4b06ce60741c7a87ce42c8218072e88,
+     0x66a23f1ab8b6d8fe442e3d437204e52db2221a58008a05a6c4647159c324c985),
+    ((1 << 255) - 8, 2**255 - 20),
+    ))
+def test_ladder_25519(k, u):
+    p = 2**255 - 19
+    assert ec._ladder_25519(k, u) == ec._ladder(k, u, (486662 - 2) >> 2, p, 255)
+
+@pytest.mark.parametrize('group', ('secp256r1', 'secp384r1', 'secp521r1'))
+@pytest.mark.parametrize('window', (2, 4, 5))
+def test_weierstrass_multiply(group, window):
+    info = GROUP_INFO_BY_STR[group]
+    curve = ec.Weierstrass(a=info.a, b=info.b, p=info.p)
+    G = curve(info.Gx, info.Gy)
+    for k in (1, 2, 3, 15, 16, 17, info.n - 1, info.n >> 1 | 1, 0xdeadbeef << 100):
+        expected = k * G
+        result = G.multiply(k, window=window)
+        assert (result.x, result.y) == (expected.x, expected.y)
+    result = G.multiply(info.n, window=window)
+    assert (result.x, result.y) == (0, 0)
+
+@pytest.mark.parametrize('group', ('secp256r1', 'secp384r1', 'x25519'))
+def test_ecdh_agreement(group):
+    ecdh = ECDH(GROUP_INFO_BY_STR[group])
+    priv_a, pub_a = ecdh.generate_key_pair()
+    priv_b, pub_b = ecdh.generate_key_pair()
+    assert ecdh.create_secret(priv_a, pub_b) == ecdh.create_secret(priv_b, pub_a)
+
+@pytest.mark.parametrize('group', ('secp256r1', 'secp384r1', 'secp521r1'))
+def test_weierstrass_fixed_base(group):
+    info = GROUP_INFO_BY_STR[group]
+    curve = ec.Weierstrass(a=info.a, b=info.b, p=info.p)
+    G = curve(info.Gx, info.Gy)
+    ecdh = ECDH(info)
+    size = info.bits + 7 >> 3
+    for k in (1, 2, 15, 16, 17, 0x1234 << 200, info.n - 1):
+        expected = G.multiply(k)
+        _, pub = ecdh.generate_key_pair(k)
+        assert pub == b'\x04' + expected.x.to_bytes(size, 'big') + expected.y.to_bytes(size, 'big')
+
+@pytest.mark.parametrize('group', ('x25519', 'x448'))
+def test_montgomery_fixed_base(group):
+    info = GROUP_INFO_BY_STR[group]
+    ecdh = ECDH(info)
+    size = info.bits + 7 >> 3
+    g = info.U_P.to_bytes(size, 'little')
+    for k in (bytes(size), bytes(range(size)), b'\xff' * size):
+        _, pub = ecdh.generate_key_pair(k)
+        assert pub == ecdh.apply(k, g)
+
+def test_fixed_base_cache_dir(tmp_path, monkeypatch):
+    info = GROUP_INFO_BY_STR['secp256r1']
+    monkeypatch.setattr(fixedbase, '_tables', {})
+    monkeypatch.setattr(fixedbase, '_cache_dir', str(tmp_path))
+    table = fixedbase.fixed_base_table(info.id)
+    assert (tmp_path / 'secp256r1.fbt.json').exists()
+    monkeypatch.setattr(fixedbase, '_tables', {})
+    loaded = fixedbase.fixed_base_table(info.id)
+    assert loaded is not table
+    assert loaded.rows == table.rows
+    # a damaged file is rebuilt
+    (tmp_path / 'secp256r1.fbt.json').write_text('{')
+    monkeypatch.setattr(fixedbase, '_tables', {})
+    assert fixedbase.fixed_base_table(info.id).rows == table.rows
+
+@pytest.mark.parametrize('group', ('secp256r1', 'x25519'))
+def test_fixed_base_cache_tampered(group, tmp_path, monkeypatch):
+    # entries, which are valid curve points, but not the right multiples
+    info = GROUP_INFO_BY_STR[group]
+    monkeypatch.setattr(fixedbase, '_tables', {})
+    monkeypatch.setattr(fixedbase, '_cache_dir', str(tmp_path))
+    table = fixedbase.fixed_base_table(info.id)
+    path = tmp_path / f'{group}.fbt.json'
+    for i, j in ((0, 1), (7, 14), (len(table.rows) - 1, 3)):
+        data = table.dump()
+        row = data['rows'][i]
+        row[j], row[j - 1] = row[j - 1], row[j]
+        path.write_text(json.dumps(data))
+        monkeypatch.setattr(fixedbase, '_tables', {})
+        assert fixedbase.fixed_base_table(info.id).rows == table.rows
+    assert fixedbase.FixedBaseTable.load(json.loads(path.read_text())).rows \
+        == table.rows
+
+@pytest.mark.parametrize('group', ('secp256r1', 'secp384r1', 'secp521r1'))
+def test_weierstrass_calculate_y(group):
+    info = GROUP_INFO_BY_STR[group]
+    curve = ec.Weierstrass(a=info.a, b=info.b, p=info.p)
+    assert curve(info.Gx).y in (info.Gy, info.p - info.Gy)
+
+def test_jacobian_to_affine():
+    info = GROUP_INFO_BY_STR['secp256r1']
+    p = info.p
+    points = [(info.Gx * z * z % p, info.Gy * z * z * z % p, z) for z in (1, 2, 12345, p - 1)]
+    points.insert(2, (1, 1, 0))
+    G = (info.Gx, info.Gy)
+    assert ec.jacobian_to_affine(points, p) == [G, G, None, G, G]
@@ -0,0 +1,12 @@
+#!/usr/bin/python3
+
+from genkey import write_key
+
+def test_write_key(tmp_path):
+    (tmp_path / 'key-000002.pem').write_text('old')
+    assert write_key(str(tmp_path), 1, 'a') == 1
+    assert write_key(str(tmp_path), 2, 'b') == 3 # existing key is kept
+    assert (tmp_path / 'key-000002.pem').read_text() == 'old'
+    assert (tmp_path / 'key-000003.pem').read_text() == 'b'
+    for name in ('key-000001.pem', 'key-000003.pem'):
+        assert (tmp_path / name).stat().st_mode & 0o077 == 0
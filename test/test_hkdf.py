@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+
+import pytest
+from crypto.hkdf import HKDF
+from crypto.hash import hmac, sha256, sha256_unrolled, sha384
+
+@pytest.mark.parametrize('hash_function', (sha256, sha256_unrolled))
+def test_hkdf_rfc5869(hash_function):
+    # RFC 5869, A.1
+    hkdf = HKDF(hash_function)
+    prk = hkdf.extract(bytes(range(13)), b'\x0b' * 22)
+    assert prk.hex() == '077709362c2e32df0ddc3f0dc47bba6390b6c73bb50f9c3122ec844ad7c2b3e5'
+    okm = hkdf.expand(prk, bytes(range(0xf0, 0xfa)), 42)
+    assert okm.hex() == '3cb25f25faacd57a90434f64d0362f2a2d2d0a90cf1a5a4c5db02d56ecc4c5bf34007208d5b887185865'
+
+def test_hkdf_key_cache():
+    hkdf = HKDF(sha256)
+    hkdf.key_cache_size = 2
+    keys = [bytes([i]) * 32 for i in range(3)]
+    expected = [hmac(b'data', key=key, hash_function=sha256).digest() for key in keys]
+    for _ in range(2):
+        assert [hkdf.hmac_hash(key, b'data') for key in keys] == expected
+    assert list(hkdf._keys) == keys[1:]
+    hkdf.hmac_hash(keys[1], b'')
+    assert list(hkdf._keys) == [keys[2], keys[1]]
+
+@pytest.mark.parametrize('func', (sha256, sha384))
+def test_hash_copy(func):
+    o = func(b'a' * 100)
+    c = o.copy()
+    assert type(c) is func
+    o.update(b'b')
+    c.update(b'c')
+    assert o.digest() == func(b'a' * 100 + b'b').digest()
+    assert c.digest() == func(b'a' * 100 + b'c').digest()
+
+def test_hmac_copy():
+    o = hmac(b'message', key=b'key', hash_function=sha256)
+    c = o.copy()
+    o.update(b'1')
+    assert c.digest() == hmac(b'message', key=b'key', hash_function=sha256).digest()
+    assert o.digest() == hmac(b'message1', key=b'key', hash_function=sha256).digest()
+    assert o.digest() == o.digest() # digest does not change the state
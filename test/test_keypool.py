@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+
+import itertools
+import time
+import pytest
+from crypto.keypool import KeySharePool, key_share_pool
+from crypto.groupinfo import GROUP_INFO_BY_STR
+
+class CountingKeyManager:
+    def __init__(self):
+        self.group = GROUP_INFO_BY_STR['x25519']
+        self.counter = itertools.count()
+    def generate_key_pair(self):
+        n = next(self.counter)
+        return n, n.to_bytes(4, 'big')
+
+def wait_for(pool, count):
+    deadline = time.monotonic() + 5
+    while len(pool) < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+def test_pool_hits_and_misses():
+    pool = KeySharePool(CountingKeyManager(), size=4, low_watermark=1)
+    pool.start()
+    wait_for(pool, 4)
+    pairs = [pool.get() for _ in range(3)]
+    assert (pool.hits, pool.misses) == (3, 0)
+    wait_for(pool, 4) # refilled after falling to the low watermark
+    pool.stop()
+    assert len(pool) == 0
+    pairs += [pool.get() for _ in range(2)]
+    assert (pool.hits, pool.misses) == (3, 2)
+    # every pair is used once
+    assert len({priv for priv, _ in pairs}) == len(pairs)
+
+@pytest.mark.parametrize('size,low_watermark', ((4, 4), (4, -1), (0, 0)))
+def test_pool_invalid_watermarks(size, low_watermark):
+    with pytest.raises(ValueError):
+        KeySharePool(CountingKeyManager(), size=size, low_watermark=low_watermark)
+
+def test_group_pool():
+    info = GROUP_INFO_BY_STR['x25519']
+    pool = key_share_pool(info.id)
+    assert key_share_pool(info.id) is pool
+    priv, pub = pool.get()
+    assert pool.key_manager.generate_key_pair(priv)[1] == pub
@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+
+import pytest
+from crypto.modular import Modular
+
+PRIMES = (7, 13, 17, 41, 2**255 - 19)
+
+@pytest.mark.parametrize('p', PRIMES)
+def test_modular_arithmetic(p):
+    M = Modular(p)
+    a, b = M(p - 3), M(5 % p)
+    assert int(a + b) == (p + 2) % p
+    assert int(a - b) == (p - 8) % p
+    assert int(a * b) == (p - 15) % p
+    assert int(3 * b) == 15 % p
+    assert int(-a) == 3
+    assert int(a * a.inverse()) == 1
+    assert int(b / a * a) == int(b)
+    assert int(a ** 3) == pow(p - 3, 3, p)
+
+@pytest.mark.parametrize('p', PRIMES)
+def test_modular_inplace(p):
+    M = Modular(p)
+    a = M(p - 3)
+    b = M(5)
+    c = a
+    a += b
+    assert a is c
+    assert int(a) == 2
+    a -= b
+    assert int(a) == p - 3
+    a *= b
+    assert int(a) == (p - 15) % p
+    assert int(b) == 5
+
+def test_modular_cache():
+    assert Modular(13) is Modular(13)
+    assert Modular(13) is not Modular(17)
+    assert isinstance(Modular(13)(1), Modular(13))
+    with pytest.raises(AttributeError):
+        Modular(13)(1).extra = 1
+
+def test_modular_ordering():
+    M = Modular(13)
+    assert M(3) < M(5) <= M(5) < 7
+    assert M(8) > M(5) >= 5
+    assert sorted([M(9), M(2), M(5)]) == [2, 5, 9]
+
+# p mod 8 == 1, 3, 5, 7 (and the 2-adic part of P-224's p - 1 is 2^96)
+SQRT_PRIMES = (17, 41, 97, 193, 7681, 11, 19, 13, 29, 7, 23,
+    2**224 - 2**96 + 1, 2**255 - 19)
+
+@pytest.mark.parametrize('p', SQRT_PRIMES)
+def test_modular_sqrt(p):
+    M = Modular(p)
+    for x in range(1, min(p, 200)):
+        roots = M(x * x % p).sqrt()
+        assert len(roots) == 2
+        assert roots == sorted(roots)
+        assert x % p in roots or p - x in roots
+    assert M(0).sqrt() == [0]
+    if p < 10000:
+        squares = {x * x % p for x in range(p)}
+        non_residue = min(set(range(p)) - squares)
+        assert M(non_residue).sqrt() == []
+
+@pytest.mark.parametrize('p', SQRT_PRIMES)
+def test_modular_sqrt_many(p):
+    M = Modular(p)
+    values = [x * 7919 % p for x in range(100)]
+    assert M.sqrt_many(values) == [M(v).sqrt() for v in values]
+
+def test_modular_sqrt_many_constants(monkeypatch):
+    M = Modular(2**224 - 2**96 + 1)
+    calls = []
+    constants = M._tonelli_shanks_constants
+    monkeypatch.setattr(M, '_tonelli_shanks_constants',
+        staticmethod(lambda: calls.append(1) or constants()))
+    M.sqrt_many([x * x for x in range(2, 50)])
+    assert len(calls) == 1
+
+@pytest.mark.parametrize('p', SQRT_PRIMES)
+def test_modular_sqrt_unreduced(p):
+    M = Modular(p)
+    roots = sorted({2 % p, -2 % p})
+    assert M(p + 4).sqrt() == roots
+    assert M.sqrt_many([p + 4, M(p + 4)]) == [roots, roots]
+    assert M(p).sqrt() == [0]
+
+@pytest.mark.parametrize('p', PRIMES)
+def test_modular_batch_inverse(p):
+    M = Modular(p)
+    values = [x % p or 1 for x in (1, 2, 3, p - 1, 12345, 2**64 + 13)]
+    assert M.batch_inverse(values) == [M(v).inverse() for v in values]
+    assert M.batch_inverse([M(v) for v in values]) == [M(v).inverse() for v in values]
+    assert M.batch_inverse([]) == []
+    with pytest.raises(ValueError):
+        M.batch_inverse([1, 2, p])
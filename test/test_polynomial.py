@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+
+import random
+import pytest
+from crypto.polynomial import Polynomial
+
+FIELDS = ('q,reverse', (
+    ([8, 4, 3, 1, 0], False), # AES
+    ([8, 4, 3, 1, 0], True),
+    ([128, 7, 2, 1, 0], True), # GCM
+    ([128, 7, 2, 1, 0], False),
+    ([163, 7, 6, 3, 0], False), # NIST B-163 (degree not divisible by 4)
+    ([163, 7, 6, 3, 0], True),
+))
+
+@pytest.mark.parametrize('method', ('window', 'log'))
+@pytest.mark.parametrize(*FIELDS)
+def test_multiplication(q, reverse, method):
+    if method == 'log' and max(q) > 16:
+        with pytest.raises(ValueError):
+            Polynomial(q, reverse=reverse, method=method)
+        return
+    reference = Polynomial(q, reverse=reverse)
+    fast = Polynomial(q, reverse=reverse, method=method)
+    rnd = random.Random(max(q))
+    bits = max(q)
+    for _ in range(200):
+        a = rnd.getrandbits(bits)
+        b = rnd.getrandbits(bits)
+        assert int(fast(a) * fast(b)) == int(reference(a) * reference(b))
+
+def test_log_inverse():
+    reference = Polynomial([8, 4, 3, 1, 0])
+    fast = Polynomial([8, 4, 3, 1, 0], method='log')
+    for value in range(1, 256):
+        assert int(fast(value).inverse()) == int(reference(value).inverse())
+        assert int(fast(value) * fast(value).inverse()) == 1
+        assert int(fast(value) ** 5) == int(reference(value) ** 5)
+    with pytest.raises(ZeroDivisionError):
+        fast(0).inverse()
+
+def test_inplace():
+    _P = Polynomial([8, 4, 3, 1, 0], method='window')
+    a = _P(0x57)
+    b = a
+    a *= _P(0x83) # FIPS 197, 4.2
+    assert a is b and a == 0xc1
+    a += _P(0xc1)
+    assert a is b and a == 0
+
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        Polynomial([8, 4, 3, 1, 0], method='comb')
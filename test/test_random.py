@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+
+import pytest
+from util.random import random_prime_with_bits, random_primes_with_bits
+from util.random import _check_millerrabin, _millerrabin_rounds, _sieve, _SIEVE_PRIMES
+
+def is_prime(n):
+    return n > 1 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+
+CARMICHAEL_NUMBERS = (561, 1105, 1729, 2465, 2821, 6601, 8911, 41041, 825265)
+
+def test_millerrabin():
+    for n in range(5, 5000, 2):
+        assert _check_millerrabin(n, 8) == is_prime(n)
+    for n in CARMICHAEL_NUMBERS:
+        assert not _check_millerrabin(n)
+    assert _check_millerrabin(2**127 - 1, 8)
+    assert not _check_millerrabin((2**61 - 1) * (2**89 - 1), 8)
+
+@pytest.mark.parametrize('start', (1, 3, 4099, 8191, 1 << 40 | 1))
+def test_sieve(start):
+    expected = [n for n in range(start, start + 2000, 2)
+        if all(n % r or n == r for r in _SIEVE_PRIMES)]
+    assert _sieve(start, 1000) == expected
+
+def test_millerrabin_rounds():
+    assert [_millerrabin_rounds(bits) for bits in (256, 512, 1024, 1536, 2048)] \
+        == [64, 7, 4, 3, 3]
+
+@pytest.mark.parametrize('size,leading_ones', ((6, 1), (12, 2), (64, 2), (256, 1)))
+def test_random_prime_with_bits(size, leading_ones):
+    for _ in range(10):
+        p = random_prime_with_bits(size, leading_ones=leading_ones)
+        assert p.bit_length() == size
+        assert p >> size - leading_ones == (1 << leading_ones) - 1
+        assert _check_millerrabin(p)
+    assert is_prime(random_prime_with_bits(20))
+
+@pytest.mark.parametrize('processes', (0, 2))
+def test_random_primes_with_bits(processes):
+    primes = random_primes_with_bits([128, 136], leading_ones=2, processes=processes)
+    assert [p.bit_length() for p in primes] == [128, 136]
+    assert all(_check_millerrabin(p) for p in primes)
+    p = random_prime_with_bits(128, processes=processes)
+    assert p.bit_length() == 128 and _check_millerrabin(p)
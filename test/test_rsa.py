@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+
+import hashlib
+import pytest
+from crypto.rsa import Rsa, RsaKey, RsaPrivateKey
+from crypto.rsa import pkcs1_v15_encode, verify_pkcs1_v15, verify_pkcs1_v15_batch
+from crypto.rsa import _DIGEST_INFO_PREFIX
+
+@pytest.fixture(scope='module', params=(512, 1024))
+def rsa(request):
+    r = Rsa(request.param)
+    r.generate_key_pair()
+    r.set_peer_public_key(r.get_my_public_key())
+    return r
+
+def test_rsa_textbook():
+    # RSA example: p = 61, q = 53, e = 17 -> d = 2753
+    r = Rsa(12)
+    r.generate_rsa_parameters(61, 53, 17)
+    pk = r.my_private_key
+    assert (pk.n, pk.d) == (3233, 2753)
+    assert r._private_operation(pk, 2790) == 65
+    assert pow(65, 17, 3233) == 2790
+
+def test_rsa_private_operation(rsa):
+    pk = rsa.my_private_key
+    for x in (0, 1, 2, pk.p, pk.q, pk.n - 1, pk.n >> 1 | 1):
+        assert rsa._private_operation(pk, x) == pow(x, pk.d, pk.n)
+    without_crt = pk._replace(dp=0, dq=0, qinv=0)
+    assert rsa._private_operation(without_crt, 12345) == pow(12345, pk.d, pk.n)
+
+def test_rsa_fault_check(rsa):
+    pk = rsa.my_private_key
+    faulty = pk._replace(dp=pk.dp ^ 2)
+    with pytest.raises(ValueError):
+        rsa._private_operation(faulty, 12345)
+    rsa.fault_check = False
+    try:
+        assert rsa._private_operation(faulty, 12345) != pow(12345, pk.d, pk.n)
+    finally:
+        rsa.fault_check = True
+
+def test_rsa_encrypt_decrypt(rsa):
+    message = b'\x05message'
+    assert rsa.decrypt(rsa.encrypt(message)) == message
+
+@pytest.mark.parametrize('block_type', (1, 2))
+def test_rsa_pkcs1_blocks(rsa, block_type):
+    data = b'some data'
+    if block_type == 1: # signature: private key, verify with public key
+        encrypted = rsa._encrypt(1, rsa.my_private_key, data)
+        assert rsa._decrypt(rsa.get_my_public_key(), encrypted) == data
+    else:
+        encrypted = rsa._encrypt(2, rsa.get_my_public_key(), data)
+        assert rsa._decrypt(rsa.my_private_key, encrypted) == data
+    assert len(encrypted) == rsa.my_private_key.size >> 3
+
+def sign(rsa, message, hash_name='sha256'):
+    digest = hashlib.new(hash_name, message).digest()
+    return rsa._encrypt(1, rsa.my_private_key, _DIGEST_INFO_PREFIX[hash_name] + digest)
+
+@pytest.mark.parametrize('hash_name', ('sha1', 'sha256', 'sha384'))
+def test_rsa_pkcs1_verify(rsa, hash_name):
+    if rsa.size < 1024 and hash_name == 'sha384':
+        pytest.skip('Key too short for the hash')
+    signature = sign(rsa, b'message', hash_name)
+    key = rsa.get_my_public_key()
+    digest = hashlib.new(hash_name, b'message').digest()
+    assert verify_pkcs1_v15(signature, key, digest)
+    assert verify_pkcs1_v15(signature, key, digest, hash_name)
+    assert not verify_pkcs1_v15(signature, key, hashlib.new(hash_name, b'massage').digest())
+    assert not verify_pkcs1_v15(signature[:-1], key, digest)
+    assert not verify_pkcs1_v15(b'\xff' * len(signature), key, digest)
+
+def test_rsa_pkcs1_encode():
+    encoded = pkcs1_v15_encode(bytes(32), 64)
+    assert len(encoded) == 64
+    assert encoded.startswith(b'\0\x01\xff\xff') and encoded.endswith(b'\x04\x20' + bytes(32))
+    with pytest.raises(ValueError):
+        pkcs1_v15_encode(bytes(32), 61)
+
+@pytest.mark.parametrize('processes', (0, 2))
+def test_rsa_pkcs1_verify_batch(rsa, processes):
+    key = rsa.get_my_public_key()
+    messages = [b'a', b'b', b'c', b'd']
+    items = [(sign(rsa, m), key, hashlib.sha256(m).digest()) for m in messages]
+    items[2] = (items[2][0], key, hashlib.sha256(b'x').digest())
+    assert verify_pkcs1_v15_batch(items, processes=processes) == [True, True, False, True]
+    assert verify_pkcs1_v15_batch([], processes=processes) == []
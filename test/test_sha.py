@@ -1,14 +1,27 @@
 #!/usr/bin/python3
 
+import array
+import hashlib
 import pytest
 from crypto.hash import sha224, sha256, sha384, sha512
+from crypto.hash import Registry
+from crypto.cryptosuite import CryptoSuite
+from crypto.hash import sha224_unrolled, sha256_unrolled, sha384_unrolled, sha512_unrolled
 
 # processing 1M data takes too much time, and it is even unnecessary. It is
 # still here, because it has been defined in the specifications:
 # FIPS 180-2 (sha256, sha384, sha512), RFC3874 (sha224)
+# The optimized variants are always checked with them.
 TEST_LONG_MESSAGES = False
 
-@pytest.mark.parametrize('message,func,hash', (
+UNROLLED = {
+    sha224: sha224_unrolled,
+    sha256: sha256_unrolled,
+    sha384: sha384_unrolled,
+    sha512: sha512_unrolled,
+    }
+
+TEST_VECTORS = ('message,func,hash', (
     # ==== SHA-224 ====
     (   # empty
         b'',
@@ -142,6 +155,8 @@ TEST_LONG_MESSAGES = False
         sha512,
         'e718483d0ce769644e2e42c7bc15b4638e1f98b13b2044285632a803afa973ebde0ff244877ea60a4cb0432ce577c31beb009c5c2c49aa2e4eadb217ad8cc09b'),
 ))
+
+@pytest.mark.parametrize(*TEST_VECTORS)
 def test_sha(message, func, hash):
     if not TEST_LONG_MESSAGES and len(message) >= 1_000_000:
         return
@@ -153,6 +168,49 @@ def test_sha(message, func, hash):
     o.update(message)
     assert o.hexdigest() == hash
 
+@pytest.mark.parametrize('func', (sha224, sha256, sha384, sha512))
+@pytest.mark.parametrize('chunks', (
+    (1,) * 10 + (63, 64, 65, 127, 128, 129, 1000),
+    (0, 5, 0, 200, 0),
+    (3000,),
+    ))
+def test_sha_update_chunks(func, chunks):
+    message = bytes(range(256)) * 12
+    o = func()
+    pos = 0
+    for i, size in enumerate(chunks):
+        part = message[pos:pos+size]
+        # any buffer-protocol object is accepted
+        o.update((bytes, bytearray, memoryview)[i % 3](part))
+        pos += size
+    o.update(message[pos:])
+    assert o.hexdigest() == hashlib.new(func.__name__, message).hexdigest()
+
+def test_sha_update_buffer_types():
+    words = array.array('I', range(100))
+    assert sha256(words).digest() == sha256(words.tobytes()).digest()
+    buffer = bytearray(b'a' * 100)
+    o = sha256(memoryview(buffer)[10:90])
+    buffer[:] = bytes(100) # no reference is kept to the caller's buffer
+    assert o.digest() == sha256(b'a' * 80).digest()
+
+@pytest.mark.parametrize(*TEST_VECTORS)
+def test_sha_unrolled(message, func, hash):
+    func = UNROLLED[func]
+    o = func(message)
+    assert o.hexdigest() == hash
+    assert len(o.digest()) == o.digest_size
+    o = func()
+    for pos in range(0, len(message), 1000):
+        o.update(message[pos:pos+1000])
+    assert o.hexdigest() == hash
+
+def test_sha_registry():
+    for func in UNROLLED.values():
+        assert Registry.get(func().name) is func
+    assert CryptoSuite(0x1301).hash_function is sha256_unrolled
+    assert CryptoSuite(0x1302).hash_function is sha384_unrolled
+
 # TODO Separate tests
 # TODO test name
 # TODO test update after digesting
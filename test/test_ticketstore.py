@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+
+import multiprocessing
+import os
+import pytest
+import time
+import tls
+from tls.keyexchange import KeyExchange
+from tls.ticketstore import ResumptionTicket, MemoryTicketStore, FileTicketStore
+from crypto.cryptosuite import CryptoSuite
+from crypto.transcripthash import TranscriptHash
+
+def mk_ticket(n: int, received: float = 1000.0, lifetime: int = 3600) -> ResumptionTicket:
+    return ResumptionTicket(ticket=bytes([n]) * 16, psk=bytes([n]) * 32,
+        cipher_suite=0x1301, lifetime=lifetime, age_add=0xfffffff0,
+        received=received)
+
+def test_ticket_age():
+    ticket = mk_ticket(1)
+    assert ticket.age(1002.5) == 2.5
+    assert ticket.obfuscated_age(1002.5) == 2500 - 16
+    assert not ticket.expired(1000.0 + 3599)
+    assert ticket.expired(1000.0 + 3600)
+    assert mk_ticket(1, lifetime=10**7).expired(1000.0 + 604800)
+
+STORES = {
+    'memory': lambda path, **kwargs: MemoryTicketStore(**kwargs),
+    'file': lambda path, **kwargs: FileTicketStore(str(path), **kwargs),
+    }
+
+@pytest.mark.parametrize('store_type', STORES)
+def test_ticket_store(store_type, tmp_path):
+    store = STORES[store_type](tmp_path, max_per_host=2)
+    t0 = time.time()
+    for n in range(3):
+        store.add('a:443', mk_ticket(n, t0))
+    store.add('b:443', mk_ticket(3, t0, lifetime=0)) # not to be resumed
+    assert len(store) == 2
+    assert store.take('a:443') == mk_ticket(2, t0) # newest first
+    assert store.take('a:443') == mk_ticket(1, t0)
+    assert store.take('a:443') is None
+    assert store.take('b:443') is None
+    store.add('a:443', mk_ticket(4, t0))
+    assert store.take('a:443', t0 + 3600) is None # expired
+    assert len(store) == 0
+
+@pytest.mark.parametrize('store_type', STORES)
+def test_ticket_store_sweep(store_type, tmp_path):
+    store = STORES[store_type](tmp_path)
+    t0 = time.time()
+    store.add('a:443', mk_ticket(1, t0, lifetime=10))
+    store.add('b:443', mk_ticket(2, t0))
+    store.sweep(t0 + 10)
+    assert len(store) == 1
+    assert store.take('a:443') is None
+    assert store.take('b:443') == mk_ticket(2, t0)
+
+def test_memory_ticket_store_lru():
+    store = MemoryTicketStore(max_hosts=2)
+    t0 = time.time()
+    for n, key in enumerate(('a:443', 'b:443', 'a:443', 'c:443')):
+        store.add(key, mk_ticket(n, t0))
+    assert store.take('b:443') is None
+    assert store.take('a:443') == mk_ticket(2, t0)
+    assert store.take('c:443') == mk_ticket(3, t0)
+
+def _take(path: str) -> ResumptionTicket|None:
+    return FileTicketStore(path).take('a:443')
+
+def test_file_ticket_store_processes(tmp_path):
+    # every ticket is taken exactly once by the competing processes
+    store = FileTicketStore(str(tmp_path), max_per_host=32)
+    t0 = time.time()
+    for n in range(24):
+        store.add('a:443', mk_ticket(n, t0))
+    with multiprocessing.Pool(4) as pool:
+        taken = pool.map(_take, [str(tmp_path)] * 32)
+    assert sorted(t.ticket for t in taken if t is not None) \
+        == [mk_ticket(n).ticket for n in range(24)]
+    assert len(store) == 0
+    assert sorted(os.listdir(tmp_path)) == ['.lock']
+
+@pytest.mark.parametrize('remove_fails', (False, True))
+def test_file_ticket_store_write_error(remove_fails, tmp_path, monkeypatch):
+    # a ticket, which could not be removed from the file, is never returned
+    store = FileTicketStore(str(tmp_path))
+    t0 = time.time()
+    for n in range(2):
+        store.add('a:443', mk_ticket(n, t0))
+    def fail(*args):
+        raise OSError('disk full')
+    monkeypatch.setattr(os, 'replace', fail)
+    if remove_fails:
+        remove = os.remove
+        monkeypatch.setattr(os, 'remove',
+            lambda path: fail() if path.endswith('.json') else remove(path))
+        assert store.take('a:443') is None
+        assert sorted(os.listdir(tmp_path)) == ['.lock', 'a%3A443.json']
+    else:
+        assert store.take('a:443') == mk_ticket(1, t0)
+        assert sorted(os.listdir(tmp_path)) == ['.lock'] # no .tmp left
+        assert store.take('a:443') is None
+    store.add('b:443', mk_ticket(2, t0)) # not stored, but no error either
+    assert 'b%3A443.json' not in os.listdir(tmp_path)
+
+def test_file_ticket_store_permissions(tmp_path):
+    # the files contain PSKs: nothing for the group or others
+    path = tmp_path / 'tickets'
+    store = FileTicketStore(str(path))
+    store.add('a:443', mk_ticket(1, time.time()))
+    assert sorted(os.listdir(path)) == ['.lock', 'a%3A443.json']
+    for p in (path, path / '.lock', path / 'a%3A443.json'):
+        assert p.stat().st_mode & 0o077 == 0
+
+@pytest.mark.parametrize('handshake_type, content', (
+    (1, '000a' '0004' '01020304' '00000007' '0005' '04' 'aabbccdd'),
+    (2, '0000'),
+    ))
+def test_pre_shared_key(handshake_type, content):
+    ext = tls.PreSharedKey()
+    ext.handshake_type = handshake_type
+    raw = bytes.fromhex('0029' + f'{len(content) // 2:04x}' + content)
+    ext.unpack(raw)
+    if handshake_type == 1:
+        assert ext.identities == [(b'\1\2\3\4', 7)]
+        assert ext.binders == [bytes.fromhex('aabbccdd')]
+        assert ext.binders_length() == 7
+    else:
+        assert ext.selected_identity == 0
+    assert ext.pack() == raw
+
+@pytest.mark.parametrize('cipher_suite', (0x1301, 0x1302))
+def test_client_hello_binder(cipher_suite):
+    store = MemoryTicketStore()
+    ticket = mk_ticket(5)._replace(cipher_suite=cipher_suite, received=time.time())
+    client = tls.Client(hostname='localhost', key_pool=False, ticket_store=store)
+    store.add(client.ticket_key, ticket)
+    raw = client.mk_client_hello().pack()
+    assert client.psk_ticket == ticket
+    ch = tls.unpack_message(22, raw[5:])
+    psk = ch.extensions[-1]
+    assert type(psk) is tls.PreSharedKey
+    assert psk.identities[0].identity == ticket.ticket
+    kex = KeyExchange(CryptoSuite(cipher_suite))
+    kex.generate_early_secret(ticket.psk)
+    assert psk.binders == [kex.psk_binder([raw[5:-psk.binders_length()]])]
+    # tickets are used only once
+    client.mk_client_hello()
+    assert client.psk_ticket is None
+
+class FixedTranscript(TranscriptHash):
+    # transcript hash as printed in a trace, without the messages
+    def __init__(self, digest: str):
+        super().__init__()
+        self._digest = bytes.fromhex(digest)
+
+    def digest(self) -> bytes:
+        return self._digest
+
+def test_resumption_key_schedule_rfc8448():
+    # RFC 8448, 3 (Simple 1-RTT Handshake) and 4 (Resumed 0-RTT Handshake)
+    kex = KeyExchange(CryptoSuite(0x1301))
+    kex.master_secret = bytes.fromhex(
+        '18df06843d13a08bf2a449844c5f8a478001bc4d4c627984d5a41da8d0402919')
+    # client_hello .. client_finished
+    kex.generate_resumption_secret(FixedTranscript(
+        '209145a96ee8e2a122ff810047cc952684658d6049e86429426db87c54ad143d'))
+    assert kex.resumption_master_secret == bytes.fromhex(
+        '7df235f2031d2a051287d02b0241b0bfdaf86cc856231f2d5aba46c434ec196c')
+    psk = kex.ticket_psk(b'\0\0')
+    assert psk == bytes.fromhex(
+        '4ecd0eb6ec3b4d87f5d6028f922ca4c5851a277fd41311c9e62d2c9492e1c4f3')
+
+    kex = KeyExchange(CryptoSuite(0x1301))
+    kex.generate_early_secret(psk)
+    assert kex.early_secret == bytes.fromhex(
+        '9b2188e9b2fc6d64d71dc329900e20bb41915000f678aa839cbb797cb7d8332c')
+    assert kex.binder_key == bytes.fromhex(
+        '69fe131a3bbad5d63c64eebcc30e395b9d8107726a13d074e389dbc8a4e47256')
+    # client_hello truncated before the binders
+    assert kex.psk_binder(FixedTranscript(
+        '63224b2e4573f2d3454ca84b9d009a04f6be9e05711a8396473aefa01e924a14')) \
+        == bytes.fromhex(
+        '3add4fb2d8fdf822a0ca3cf7678ef5e88dae990141c5924d57bb6fa31b9e5f9d')
+
+def test_early_traffic_keys_rfc8448():
+    # RFC 8448, 4 (Resumed 0-RTT Handshake)
+    kex = KeyExchange(CryptoSuite(0x1301))
+    kex.generate_early_secret(bytes.fromhex(
+        '4ecd0eb6ec3b4d87f5d6028f922ca4c5851a277fd41311c9e62d2c9492e1c4f3'))
+    # complete client_hello
+    kex.generate_early_traffic_keys(FixedTranscript(
+        '08ad0fa05d7c7233b1775ba2ff9f4c5b8b59276b7f227f13a976245f5d960913'))
+    assert kex.client_early_traffic_secret == bytes.fromhex(
+        '3fbbe6a60deb66c30a32795aba0eff7eaa10105586e7be5c09678d63b6caab62')
+    assert kex.client_early_write_key == bytes.fromhex('920205a5b7bf2115e6fc5c2942834f54')
+    assert kex.client_early_write_iv == bytes.fromhex('6d475f0993c8e564610db2b9')
+
+@pytest.mark.parametrize('handshake_type, content', ((4, '00004000'), (1, ''), (8, '')))
+def test_early_data_extension(handshake_type, content):
+    ext = tls.EarlyData()
+    ext.handshake_type = handshake_type
+    raw = bytes.fromhex('002a' + f'{len(content) // 2:04x}' + content)
+    ext.unpack(raw)
+    assert ext.max_early_data_size == (16384 if content else None)
+    assert ext.pack() == raw
+
+@pytest.mark.parametrize('max_early_data, early_data_size, offered', (
+    (16384, 100, True),
+    (16384, 16384, True),
+    (16384, 16385, False),
+    (0, 100, False),
+    (16384, 0, False),
+    ))
+def test_client_hello_early_data(max_early_data, early_data_size, offered):
+    store = MemoryTicketStore()
+    client = tls.Client(hostname='localhost', key_pool=False, ticket_store=store)
+    store.add(client.ticket_key, mk_ticket(6, received=time.time())._replace(
+        max_early_data=max_early_data))
+    ch = client.mk_client_hello(early_data_size)
+    types = [type(e) for e in ch.extensions]
+    assert types[-1] is tls.PreSharedKey
+    assert (tls.EarlyData in types) == offered
+    assert (client.early_key_exchange is not None) == offered
+    if offered:
+        kex = client.early_key_exchange
+        raw = ch.pack()[5:]
+        kex.generate_early_traffic_keys([raw])
+        assert kex.client_early_traffic_secret == kex.crypto_suite.hkdf.derive_secret(
+            kex.early_secret, 'c e traffic', [raw])
+        assert len(kex.client_early_write_key) == kex.crypto_suite.key_length
@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+
+import pytest
+import sys
+import tls13
+
+class FakeClient:
+    def __init__(self, **kwargs):
+        self.options = kwargs
+
+    def connect(self):
+        pass
+
+@pytest.mark.parametrize('options, resumption', (
+    ([], True),
+    (['-c'], False),
+    (['-v'], False),
+    (['-c', '-v'], False),
+    ))
+def test_connect_resumption(options, resumption, monkeypatch):
+    # certificates are sent only in a full handshake
+    monkeypatch.setattr(sys, 'argv', ['tls13.py', *options, 'localhost:4433'])
+    monkeypatch.setattr(tls13, 'Client', FakeClient)
+    tls13.get_args()
+    tool = tls13.Tool()
+    tool.process_url(tls13.args.url)
+    tool.connect()
+    assert tool.client.options['resumption'] == resumption
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+
+import pytest
+from crypto.cryptosuite import CryptoSuite
+from tls.keyexchange import KeyExchange
+from crypto.transcripthash import TranscriptHash
+
+MESSAGES = [bytes([i]) * (100 * i + 7) for i in range(1, 8)]
+
+@pytest.mark.parametrize('cipher_suite', (0x1301, 0x1302))
+def test_transcript_hash(cipher_suite):
+    hash_function = CryptoSuite(cipher_suite).hash_function
+    transcript = TranscriptHash()
+    transcript.update(MESSAGES[0]) # before the hash function is known
+    with pytest.raises(ValueError):
+        transcript.digest()
+    transcript.set_hash_function(hash_function)
+    for i, message in enumerate(MESSAGES[1:], 2):
+        snapshot = transcript.copy()
+        transcript.update(message)
+        assert transcript.digest() == hash_function(b''.join(MESSAGES[:i])).digest()
+        assert snapshot.digest() == hash_function(b''.join(MESSAGES[:i-1])).digest()
+
+def test_transcript_hash_copy_pending():
+    transcript = TranscriptHash()
+    transcript.update(MESSAGES[0])
+    snapshot = transcript.copy()
+    transcript.update(MESSAGES[1])
+    snapshot.set_hash_function(CryptoSuite(0x1301).hash_function)
+    assert snapshot.digest() == CryptoSuite(0x1301).hash_function(MESSAGES[0]).digest()
+
+@pytest.mark.parametrize('cipher_suite', (0x1301, 0x1302))
+def test_key_schedule_transcript(cipher_suite):
+    kex = [KeyExchange(CryptoSuite(cipher_suite)) for _ in range(2)]
+    transcript = TranscriptHash(kex[0].crypto_suite.hash_function)
+    for message in MESSAGES[:2]:
+        transcript.update(message)
+    shared_secret = bytes(range(32))
+    kex[0].generate_handshake_keys(shared_secret, MESSAGES[:2])
+    kex[1].generate_handshake_keys(shared_secret, transcript.copy())
+    for message in MESSAGES[2:]:
+        transcript.update(message)
+    kex[0].generate_application_keys(MESSAGES)
+    kex[1].generate_application_keys(transcript.copy())
+    for name in ('client_handshake_traffic_secret', 'server_handshake_traffic_secret',
+            'client_application_traffic_secret', 'server_application_traffic_secret'):
+        assert getattr(kex[0], name) == getattr(kex[1], name)
+    assert kex[0].server_finished_verify_data(MESSAGES) \
+        == kex[1].server_finished_verify_data(transcript)
+
+@pytest.mark.parametrize('messages', (MESSAGES[:3], tuple(MESSAGES[:3])))
+def test_transcript_messages_sequence(messages):
+    # any sequence of messages is hashed, only a TranscriptHash is not
+    kex = KeyExchange(CryptoSuite(0x1301))
+    kex.generate_handshake_keys(bytes(32), messages)
+    transcript = TranscriptHash(kex.crypto_suite.hash_function)
+    for message in MESSAGES[:3]:
+        transcript.update(message)
+    hkdf = kex.crypto_suite.hkdf
+    assert hkdf.derive_secret(b'k', 'x', messages) \
+        == hkdf.derive_secret(b'k', 'x', transcript)
+    assert kex.server_finished_verify_data(messages) \
+        == kex.server_finished_verify_data(transcript)
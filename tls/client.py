@@ -1,37 +1,68 @@
 #!/usr/bin/python3
 
 import socket
+import time
 
 import tls
 import crypto
 
 from .connect import Connect
 from .message import Message
+from crypto.ciphersuite import CIPHER_SUITE_BY_ID
 from crypto.ecdh import ECDH
 from crypto.ffdh import FFDH
 from crypto.groupinfo import *
+from crypto.keypool import key_share_pool
 from .keyexchange import KeyExchange
+from .ticketstore import ResumptionTicket, TicketStore, default_ticket_store
+from crypto.transcripthash import TranscriptHash
 from util.verbose import *
 
 class Client(Connect):
     """
+    Session tickets received from a server are kept in a ticket store (by
+    default shared by all clients of the process), and used for resuming the
+    session (PSK) by the next connection to the same host and port. A resumed
+    handshake skips the transfer of the server certificates, and if the ticket
+    permits, application data can be sent right behind `client_hello` (0-RTT,
+    see `connect`).
+
     Limitations
     -----------
     - Key share group is not negotiated (selectable by client, though)
+    - Only a single PSK is offered
     """
     def __init__(self, *,
             hostname: str, port: int = 443, timeout: float = 30.0,
             key_share_group: str = 'x25519',
+            key_pool: bool = True,
+            resumption: bool = True,
+            psk_modes: tuple[str, ...] = ('psk_dhe_ke',),
+            ticket_store: TicketStore|None = None,
             mode: str = 'b',
             verbosity: int = 0,
         ):
         verbose(1, verbosity, f"Initialize TLS connection...")
         super().__init__(hostname=hostname, port=port, timeout=timeout,
                                                      verbosity=verbosity)
+        self.use_key_pool = key_pool
         self.set_group_info(key_share_group)
         self.text_mode = mode == 't'
         verbose(2, verbosity, f"Set mode to {'text' if mode == 't' else 'binary'}")
         self.session_tickets = []
+        self.ticket_store = None
+        if resumption:
+            self.ticket_store = ticket_store
+            if ticket_store is None:
+                self.ticket_store = default_ticket_store()
+        self.ticket_key = f'{hostname}:{port}'
+        self.psk_modes = psk_modes
+        self.psk_ticket = None
+        self.resumed = False
+        self.early_key_exchange = None
+        self.early_crypto_suite = None
+        self.early_data_accepted = False
+        self.handshake_finished = False
 
     def set_group_info(self, group_info: int|str|tuple):
         if isinstance(group_info, str):
@@ -46,21 +77,62 @@ class Client(Connect):
             self.key_manager = FFDH(self.group_info)
         else: # Elliptic curve group
             self.key_manager = ECDH(self.group_info)
+        # pre-generated single-use key pairs of the group
+        self.key_pool = None
+        if self.use_key_pool:
+            self.key_pool = key_share_pool(self.group_info.id)
+            self.key_pool.start()
+
+    def connect(self, early_data: bytes|str|None = None):
+        """Perform the handshake
 
-    def connect(self):
+        Parameters
+        ----------
+        early_data : bytes or str, optional
+            Application data to be sent as 0-RTT data, if the session is
+            resumed with a ticket permitting it. Otherwise, or if the server
+            rejects it, the data is sent right after the handshake (see
+            `early_data_accepted`). Note, that 0-RTT data can be replayed by
+            an attacker, so only idempotent requests should be sent this way.
+        """
+        if isinstance(early_data, str):
+            early_data = early_data.encode()
         verbose(1, self.verbosity, "Send client_hello...")
-        self.send_client_hello()
+        self.send_client_hello(early_data)
         verbose(1, self.verbosity, "Process server response...")
         self.process_server_response()
         verbose(1, self.verbosity, "Client finishes handshake...")
         self.finish_client_handshake()
         verbose(1, self.verbosity, "Handshake finished")
+        if early_data and not self.early_data_accepted:
+            verbose(1, self.verbosity, "Early data not accepted, sending it again")
+            self.send(early_data)
 
-    def send_client_hello(self) -> None:
+    def send_client_hello(self, early_data: bytes|None = None) -> None:
         self.socket = socket.create_connection((self.hostname, self.port), self.timeout)
-        client_hello = self.mk_client_hello()
+        self.early_crypto_suite = None
+        self.early_data_accepted = False
+        client_hello = self.mk_client_hello(len(early_data) if early_data else 0)
         content = self.send_message(client_hello)[5:]
-        self.handshakes = [content]
+        # hash function is set when the cipher suite is known (server_hello)
+        self.transcript = TranscriptHash()
+        self.transcript.update(content)
+        if self.early_key_exchange is not None:
+            self.send_early_data(content, early_data)
+
+    def send_early_data(self, client_hello: bytes, data: bytes) -> None:
+        kex = self.early_key_exchange
+        kex.generate_early_traffic_keys([client_hello])
+        crs = self.early_crypto_suite = kex.crypto_suite
+        crs.set_my_key(kex.client_early_write_key)
+        crs.set_my_nonce(kex.client_early_write_iv)
+        # compatibility mode: change_cipher_spec follows client_hello at once
+        messages = self.prepare_message(tls.ChangeCipherSpec())
+        for pos in range(0, len(data), 16384):
+            messages += self.prepare_message(
+                tls.ApplicationData(data[pos:pos+16384]), crs)
+        self.send_pack(messages)
+        verbose(1, self.verbosity, f"{len(data)} bytes early data sent")
 
     def process_server_response(self) -> None:
         goon = True
@@ -83,12 +155,22 @@ class Client(Connect):
     def finish_client_handshake(self) -> None:
         # SEND further client handshake messages
         # Change to encrypted mode
-        messages = self.prepare_message(tls.ChangeCipherSpec())
+        if self.early_crypto_suite is None:
+            messages = self.prepare_message(tls.ChangeCipherSpec())
+        else: # already sent
+            messages = b''
+        # application secrets: transcript up to "Server Finished"
+        application_transcript = self.transcript.copy()
+        if self.early_data_accepted:
+            end_of_early_data = tls.EndOfEarlyData()
+            messages += self.prepare_message(end_of_early_data, self.early_crypto_suite)
+            self.transcript.update(end_of_early_data.pack()[5:])
         self.encrypt_sending = True
 
         # Send "Client Finished"
-        verify_data = self.key_exchange.client_finished_verify_data(self.handshakes)
-        messages += self.prepare_message(tls.Finished(verify_data))
+        verify_data = self.key_exchange.client_finished_verify_data(self.transcript.copy())
+        finished = tls.Finished(verify_data)
+        messages += self.prepare_message(finished)
 
         self.send_pack(messages)
         # Handshake finidhed
@@ -96,12 +178,49 @@ class Client(Connect):
         # calculate application keys:
         kex = self.key_exchange
         crs = self.crypto_suite
-        kex.generate_application_keys(self.handshakes)
+        kex.generate_application_keys(application_transcript)
         crs.set_my_key(kex.client_write_key)
         crs.set_peer_key(kex.server_write_key)
         crs.set_my_nonce(kex.client_write_iv)
         crs.set_peer_nonce(kex.server_write_iv)
 
+        # resumption master secret includes "Client Finished"
+        if self.ticket_store is not None:
+            self.transcript.update(finished.pack()[5:])
+            kex.generate_resumption_secret(self.transcript)
+        self.handshake_finished = True
+        self.process_post_handshake_messages()
+
+    def receive_record(self) -> None:
+        super().receive_record()
+        if self.handshake_finished:
+            self.process_post_handshake_messages()
+
+    def process_post_handshake_messages(self) -> None:
+        while not self.message_queue.empty():
+            message = self.message_queue.get()
+            if isinstance(message, tls.NewSessionTicket):
+                self.process_session_ticket(message)
+            verbose(1, self.verbosity, f"Post-handshake message {type(message).__name__} received")
+
+    def process_session_ticket(self, message: tls.NewSessionTicket) -> None:
+        self.session_tickets.append({
+            'lifetime': message.ticket_lifetime,
+            'age_add': message.ticket_age_add,
+            'nonce': message.ticket_nonce,
+            'ticket': message.ticket,
+        })
+        if self.ticket_store is not None:
+            self.ticket_store.add(self.ticket_key, ResumptionTicket(
+                ticket=message.ticket,
+                psk=self.key_exchange.ticket_psk(message.ticket_nonce),
+                cipher_suite=self.cipher_suite,
+                lifetime=message.ticket_lifetime,
+                age_add=message.ticket_age_add,
+                received=time.time(),
+                max_early_data=message.max_early_data_size(),
+                ))
+
     def process_handshake(self, message: Message) -> None:
         message_content = message.raw_content
         rec_type = type(message)
@@ -109,6 +228,9 @@ class Client(Connect):
             self.cipher_suite = message.cipher_suite
             self.crypto_suite = crypto.CryptoSuite(self.cipher_suite)
             self.key_exchange = KeyExchange(self.crypto_suite)
+            self.transcript.set_hash_function(self.crypto_suite.hash_function)
+            self.peer_public_key = None
+            psk = None
             for extension in message.extensions:
                 ext_type = type(extension)
                 if ext_type is tls.SupportedVersions:
@@ -118,10 +240,20 @@ class Client(Connect):
                     self.peer_public_key = extension.shares[0].key_exchange
                     if self.group_info.id != group:
                         raise TypeError('Key exchange negotiation failed')
-            shared_secret = self.key_manager.create_secret(self.private_key, self.peer_public_key)
+                if ext_type is tls.PreSharedKey:
+                    psk = self.accept_psk(extension.selected_identity)
+            self.resumed = psk is not None
+            if self.peer_public_key is not None:
+                shared_secret = self.key_manager.create_secret(self.private_key, self.peer_public_key)
+            elif self.resumed: # psk_ke
+                shared_secret = None
+            else:
+                raise ConnectionError('Key share missing from server_hello')
             kex = self.key_exchange
             crs = self.crypto_suite
-            kex.generate_handshake_keys(shared_secret, self.handshakes + [message_content])
+            transcript = self.transcript.copy()
+            transcript.update(message_content)
+            kex.generate_handshake_keys(shared_secret, transcript, psk)
             crs.set_my_key(kex.client_write_key)
             crs.set_peer_key(kex.server_write_key)
             crs.set_my_nonce(kex.client_write_iv)
@@ -129,7 +261,9 @@ class Client(Connect):
             self.decrypt_received = True
         elif rec_type is tls.EncryptedExtensions:
             # TODO: maybe some invalid servername, but usually nothing
-            pass
+            for extension in message.extensions:
+                if type(extension) is tls.EarlyData:
+                    self.accept_early_data()
         elif rec_type is tls.Certificate:
             self.certificate = message
             self.certificates = message.certificate_entries
@@ -137,25 +271,20 @@ class Client(Connect):
             pass
         elif rec_type is tls.CertificateVerify:
             self.certificateVerify = message
+            # up to and including Certificate (RFC8446 4.4.3)
+            self.certificateVerifyTranscriptHash = self.transcript.digest()
             # TODO verify certificate
             pass
         elif rec_type is tls.Finished:
-            verify_data = self.key_exchange.server_finished_verify_data(self.handshakes)
+            verify_data = self.key_exchange.server_finished_verify_data(self.transcript.copy())
             if message.verify_data != verify_data:
                 raise ConnectionError('Handshake verification failed')
-        elif rec_type is tls.NewSessionTicket:
-            self.session_tickets.append({
-                'lifetime': message.ticket_lifetime,
-                'age_add': message.ticket_age_add,
-                'nonce': message.ticket_nonce,
-                'ticket': message.ticket,
-            })
         else:
             raise NotImplementedError(f'Unknown handshake message received {message.handshake_type}')
-        self.handshakes.append(message_content)
+        self.transcript.update(message_content)
         verbose(1, self.verbosity, f"Handshake message {type(message).__name__} received")
 
-    def mk_client_hello(self):
+    def mk_client_hello(self, early_data_size: int = 0):
         ch = tls.ClientHello([
             'TLS_AES_128_GCM_SHA256',
             'TLS_AES_256_GCM_SHA384',
@@ -180,12 +309,52 @@ class Client(Connect):
             'tls1.3'
             ])
         ch.add_extension(e)
-        e = tls.PskKeyExchangeModes([
-            'psk_dhe_ke'
-            ])
+        e = tls.PskKeyExchangeModes(list(self.psk_modes))
         ch.add_extension(e)
-        self.private_key, self.public_key = self.key_manager.generate_key_pair()
+        if self.key_pool is not None:
+            self.private_key, self.public_key = self.key_pool.get()
+        else:
+            self.private_key, self.public_key = self.key_manager.generate_key_pair()
         e = tls.KeyShare(self.group_info.id, self.public_key)
         ch.add_extension(e)
+        self.early_key_exchange = None
+        if self.ticket_store is not None:
+            self.psk_ticket = self.ticket_store.take(self.ticket_key)
+            if self.psk_ticket is not None:
+                early_data = 0 < early_data_size <= self.psk_ticket.max_early_data
+                if early_data:
+                    ch.add_extension(tls.EarlyData())
+                kex = self.add_pre_shared_key(ch, self.psk_ticket)
+                if early_data:
+                    self.early_key_exchange = kex
         return ch
 
+    def add_pre_shared_key(self, ch: tls.ClientHello, ticket: ResumptionTicket) -> KeyExchange:
+        # must be the last extension; the binder is the MAC of the message
+        # packed up to (not including) the binders list
+        kex = KeyExchange(crypto.CryptoSuite(ticket.cipher_suite))
+        kex.generate_early_secret(ticket.psk)
+        e = tls.PreSharedKey(ticket.ticket, ticket.obfuscated_age(),
+            bytes(kex.crypto_suite.hash_length))
+        ch.add_extension(e)
+        raw = ch.pack()[5:]
+        e.binders[0] = kex.psk_binder([raw[:-e.binders_length()]])
+        return kex
+
+    def accept_psk(self, selected_identity: int) -> bytes:
+        ticket = self.psk_ticket
+        if ticket is None or selected_identity != 0:
+            raise ConnectionError('Server selected an unknown PSK')
+        if CIPHER_SUITE_BY_ID[ticket.cipher_suite].hash != self.crypto_suite.cipher_suite.hash:
+            raise ConnectionError('Cipher suite does not match the PSK')
+        verbose(1, self.verbosity, "Session resumed")
+        return ticket.psk
+
+    def accept_early_data(self) -> None:
+        # early data is accepted only with the first PSK and its cipher suite
+        if self.early_crypto_suite is None or not self.resumed \
+                or self.cipher_suite != self.psk_ticket.cipher_suite:
+            raise ConnectionError('Unexpected early data indication')
+        self.early_data_accepted = True
+        verbose(1, self.verbosity, "Early data accepted")
+
@@ -62,10 +62,21 @@ class Connect(ABC):
             application_data = bytes(application_data)
         return application_data
 
-    def prepare_message(self, message: tls.Message) -> bytes:
+    def prepare_message(self, message: tls.Message, crypto_suite=None) -> bytes:
+        """Pack a message into a record, encrypted if needed
+
+        Parameters
+        ----------
+        message : tls.Message
+            Message to be packed
+        crypto_suite : CryptoSuite, optional
+            Keys to encrypt with instead of the current ones (e.g. 0-RTT)
+        """
         raw_content = message.pack()
-        if self.encrypt_sending:
-            crs = self.crypto_suite
+        if crypto_suite is None and self.encrypt_sending:
+            crypto_suite = self.crypto_suite
+        if crypto_suite is not None:
+            crs = crypto_suite
             cs = crs.cipher_suite
             plain_text = raw_content[5:] + raw_content[:1]
             new_length = len(plain_text) + cs.t_len
@@ -99,9 +110,10 @@ class Connect(ABC):
             cipher_text = fragment[:-cs.t_len]
             auth_data = record_head
             auth_tag_received = fragment[-cs.t_len:]
-            plain_text, auth_tag_calculated = crs.aead.decrypt(cipher_text, auth_data)
-            if auth_tag_received != auth_tag_calculated:
-                raise KeyError('Key negotiation failed')
+            try:
+                plain_text = crs.aead.decrypt_and_verify(cipher_text, auth_data, auth_tag_received)
+            except ValueError as exc:
+                raise KeyError('Key negotiation failed') from exc
             content_type = unpack_u8(plain_text[-1:])
             fragment = plain_text[:-1]
             length = len(fragment)
@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+# RFC8446
+
+from util.serialize import *
+from .extension import Extension
+
+class EarlyData(Extension):
+    """Early data indication
+
+    Empty in `client_hello` and `encrypted_extensions`; in
+    `new_session_ticket` it contains the maximum size of early data the
+    server accepts with the ticket.
+    """
+    def __init__(self, max_early_data_size: int|None = None):
+        super().__init__()
+        self.extension_type = 42
+        self.max_early_data_size = max_early_data_size
+
+    def pack_extension_content(self) -> bytes:
+        if self.handshake_type == 4:
+            return pack_u32(self.max_early_data_size)
+        return b''
+
+    def unpack_extension_content(self, raw: bytes) -> None:
+        if self.handshake_type == 4:
+            self.max_early_data_size = unpack_u32(raw, 0)
+
+    def represent(self, level: int = 0) -> str:
+        text = super().represent(level, terminate=False)
+        if self.max_early_data_size is not None:
+            text += f'max_early_data_size: {self.max_early_data_size}\n'
+        else:
+            text += '~\n'
+        return text
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+# RFC8446
+
+from typing import NamedTuple
+from util.serialize import *
+from .extension import Extension
+
+class PskIdentity(NamedTuple):
+    identity: bytes
+    obfuscated_ticket_age: int
+
+class PreSharedKey(Extension):
+    """Offered PSK identities (client_hello) or the selected one (server_hello)
+
+    Note, that this extension must be the last one of `client_hello`, and the
+    binders can be calculated only after the rest of the message is packed
+    (see `binders_length`).
+    """
+    def __init__(self, identity: bytes|None = None,
+            obfuscated_ticket_age: int = 0, binder: bytes = b''):
+        super().__init__()
+        self.extension_type = 41
+        self.identities = []
+        self.binders = []
+        self.selected_identity = None
+        if identity is not None:
+            self.add(identity, obfuscated_ticket_age, binder)
+
+    def add(self, identity: bytes, obfuscated_ticket_age: int,
+            binder: bytes = b'') -> None:
+        self.identities.append(PskIdentity(identity, obfuscated_ticket_age))
+        self.binders.append(binder)
+
+    def binders_length(self) -> int:
+        """Size of the packed binders list, which closes `client_hello`"""
+        return 2 + sum(1 + len(binder) for binder in self.binders)
+
+    def pack_extension_content(self) -> bytes:
+        if self.handshake_type == 1:
+            identities = (pack_bytes(n.identity, 2) + pack_u32(n.obfuscated_ticket_age)
+                for n in self.identities)
+            binders = (pack_bytes(binder, 1) for binder in self.binders)
+            return pack_bytes_list(identities, 2) + pack_bytes_list(binders, 2)
+        elif self.handshake_type == 2:
+            return pack_u16(self.selected_identity)
+        else:
+            raise TypeError(f"Don't know, how to pack `PreSharedKey` for handshake type {self.handshake_type}")
+
+    def unpack_extension_content(self, raw: bytes) -> None:
+        if self.handshake_type == 1:
+            pos = 2 + unpack_u16(raw, 0)
+            pos_id = 2
+            while pos_id < pos:
+                identity = unpack_bytes(raw, pos_id, 2)
+                pos_id += 2 + len(identity)
+                self.identities.append(PskIdentity(identity, unpack_u32(raw, pos_id)))
+                pos_id += 4
+            self.binders = unpack_bytes_list(raw, pos, 2, 1)
+        elif self.handshake_type == 2:
+            self.selected_identity = unpack_u16(raw, 0)
+        else:
+            raise TypeError(f"Don't know, how to unpack `PreSharedKey` for handshake type {self.handshake_type}")
+
+    def represent(self, level: int = 0):
+        text = super().represent(level);
+        ind = '  '*level
+        if self.selected_identity is not None:
+            text += ind + f'  selected_identity: {self.selected_identity}\n'
+        for n, binder in zip(self.identities, self.binders):
+            text += ind + f'  - identity: {n.identity.hex()}\n'
+            text += ind + f'    obfuscated_ticket_age: {n.obfuscated_ticket_age}\n'
+            text += ind + f'    binder: {binder.hex()}\n'
+        return text
@@ -0,0 +1,12 @@
+#!/usr/bin/python3
+# RFC8446
+
+from .handshake import Handshake
+
+class EndOfEarlyData(Handshake):
+    def __init__(self):
+        super().__init__()
+        self.handshake_type = 5
+
+    def represent(self):
+        return "Handshake-end_of_early_data:\n"
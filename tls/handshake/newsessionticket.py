@@ -27,9 +27,16 @@ class NewSessionTicket(Handshake):
         self.ticket = unpack_bytes(raw, pos, 2)
         pos += 2 + len(self.ticket)
         # Note, thet the only extension which can be shared in this message is
-        # early_data, which is not supported by this project
+        # early_data
         self.unpack_extensions(raw, pos)
 
+    def max_early_data_size(self) -> int:
+        """Early data allowed with this ticket (0: no early data)"""
+        for extension in self.extensions:
+            if extension.extension_type == 42:
+                return extension.max_early_data_size
+        return 0
+
     def represent(self):
         m, s = divmod(self.ticket_lifetime, 60)
         h, m = divmod(m, 60)
@@ -1,24 +1,72 @@
 #!/usr/bin/python3
 
 from crypto.cryptosuite import CryptoSuite
+from crypto.transcripthash import TranscriptHash
 
 class KeyExchange():
     def __init__(self, crypto_suite: CryptoSuite):
         self.crypto_suite = crypto_suite
 
-    def generate_handshake_keys(self, shared_secret: bytes, messages: list[bytes]) -> None:
+    def generate_early_secret(self, psk: bytes|None = None) -> None:
+        """Generates early secret and binder key
+
+        Parameters
+        ----------
+        psk : bytes, optional
+            Pre-shared key of a resumed session, None for a full handshake
+        """
+        hkdf = self.crypto_suite.hkdf
+
+        self.early_secret = hkdf.extract(None, psk)
+        self.binder_key = hkdf.derive_secret(self.early_secret, "res binder", [])
+
+    def generate_early_traffic_keys(self, messages: list[bytes]|TranscriptHash) -> None:
+        """Generates client early traffic keys (0-RTT data)
+
+        Parameters
+        ----------
+        messages : list of bytes or TranscriptHash
+            `client_hello` message (without 5 byte message header)
+        """
+        hkdf = self.crypto_suite.hkdf
+        key_length = self.crypto_suite.key_length
+
+        self.client_early_traffic_secret \
+            = hkdf.derive_secret(self.early_secret, "c e traffic", messages)
+        self.client_early_write_key = hkdf.expand_label(
+            self.client_early_traffic_secret, 'key', b'', key_length)
+        self.client_early_write_iv = hkdf.expand_label(
+            self.client_early_traffic_secret, 'iv', b'', 12)
+
+    def psk_binder(self, messages: list[bytes]|TranscriptHash) -> bytes:
+        """Calculates the binder of a PSK (RFC8446 4.2.11.2)
+
+        Parameters
+        ----------
+        messages : list of bytes or TranscriptHash
+            `client_hello` truncated before the binders list
+        """
+        return self.finished_verify_data(self.binder_key, messages)
+
+    def generate_handshake_keys(self, shared_secret: bytes|None,
+            messages: list[bytes]|TranscriptHash, psk: bytes|None = None) -> None:
         """Generates handshake traffic keys
 
         Parameters
         ----------
-        messages : list of bytes
+        shared_secret : bytes or None
+            (EC)DHE shared secret, None in `psk_ke` mode
+        messages : list of bytes or TranscriptHash
             `client_hello` and `server_hello` messages (without 5 byte message
-            headers)
+            headers), or their transcript hash
+        psk : bytes, optional
+            Pre-shared key accepted by the server
         """
         hkdf = self.crypto_suite.hkdf
         key_length = self.crypto_suite.key_length
 
-        early_secret = hkdf.extract(None, None)
+        self.generate_early_secret(psk)
+        early_secret = self.early_secret
      
         derived_secret = hkdf.derive_secret(early_secret, "derived", [])
         self.handshake_secret = hkdf.extract(derived_secret, shared_secret)
@@ -37,20 +85,21 @@ class KeyExchange():
             self.server_handshake_traffic_secret,
             )
 
-    def generate_application_keys(self, messages: list[bytes]) -> None:
+    def generate_application_keys(self, messages: list[bytes]|TranscriptHash) -> None:
         """Generates application traffic keys
 
         Parameters
         ----------
-        messages : list of bytes
+        messages : list of bytes or TranscriptHash
             All handshake messages between and including `client_hello` and
-            `server_finished` (without 5 byte message headers)
+            `server_finished` (without 5 byte message headers), or their
+            transcript hash
         """
         hkdf = self.crypto_suite.hkdf
         key_length = self.crypto_suite.key_length
 
         derived_secret = hkdf.derive_secret(self.handshake_secret, "derived", [])
-        master_secret = hkdf.extract(derived_secret, None)
+        master_secret = self.master_secret = hkdf.extract(derived_secret, None)
      
 #>        raw_messages = b''.join(messages)
         self.client_application_traffic_secret \
@@ -63,6 +112,26 @@ class KeyExchange():
             self.server_application_traffic_secret,
             )
 
+    def generate_resumption_secret(self, messages: list[bytes]|TranscriptHash) -> None:
+        """Generates resumption master secret
+
+        Parameters
+        ----------
+        messages : list of bytes or TranscriptHash
+            All handshake messages between and including `client_hello` and
+            `client_finished` (without 5 byte message headers)
+        """
+        hkdf = self.crypto_suite.hkdf
+        self.resumption_master_secret \
+            = hkdf.derive_secret(self.master_secret, "res master", messages)
+
+    def ticket_psk(self, ticket_nonce: bytes) -> bytes:
+        """Pre-shared key of a `new_session_ticket` (RFC8446 4.6.1)"""
+        hkdf = self.crypto_suite.hkdf
+        hash_length = self.crypto_suite.hash_length
+        return hkdf.expand_label(self.resumption_master_secret, 'resumption',
+            ticket_nonce, hash_length)
+
     def update_application_keys(self, messages: list[bytes]) -> None:
         """Generates application traffic keys
 
@@ -99,19 +168,23 @@ class KeyExchange():
         self.server_write_iv \
             = hkdf.expand_label(server_secret, 'iv', b'', 12)
 
-    def client_finished_verify_data(self, messages: list[bytes]) -> bytes:
+    def client_finished_verify_data(self, messages: list[bytes]|TranscriptHash) -> bytes:
         return self.finished_verify_data(self.client_handshake_traffic_secret, messages)
 
-    def server_finished_verify_data(self, messages: list[bytes]) -> bytes:
+    def server_finished_verify_data(self, messages: list[bytes]|TranscriptHash) -> bytes:
         return self.finished_verify_data(self.server_handshake_traffic_secret, messages)
 
-    def finished_verify_data(self, secret: bytes, messages: list[bytes]) -> bytes:
+    def finished_verify_data(self, secret: bytes,
+            messages: list[bytes]|TranscriptHash) -> bytes:
         hkdf = self.crypto_suite.hkdf
         hash_function = self.crypto_suite.hash_function
         hash_length = self.crypto_suite.hash_length
 
         finished_key = hkdf.expand_label(secret, "finished", b'', hash_length)
-        tomac = hash_function(b''.join(messages)).digest()
+        if isinstance(messages, TranscriptHash):
+            tomac = messages.digest()
+        else:
+            tomac = hash_function(b''.join(messages)).digest()
         verify_data = hkdf.hmac_hash(finished_key, tomac)
 
         return verify_data
@@ -1,10 +1,12 @@
 #!/usr/bin/python3
 
+from .extension.earlydata import EarlyData
 from .extension.ecpointformats import EcPointFormats
 from .extension.encryptthenmac import EncryptThenMAC
 from .extension.extendedmastersecret import ExtendedMasterSecret
 from .extension.keyshare import KeyShare
 from .extension.padding import Padding
+from .extension.presharedkey import PreSharedKey
 from .extension.pskkeyexchangemodes import PskKeyExchangeModes
 from .extension.servername import ServerName
 from .extension.sessionticket import SessionTicket
@@ -31,8 +33,8 @@ _EXTENSION_HANDLERS = {
     22: EncryptThenMAC, #???
     23: ExtendedMasterSecret, #???
     35: SessionTicket, #???
-#>    41: PreSharedKey, # RFC 8446
-#>    42: EarlyData, # RFC 8446
+    41: PreSharedKey, # RFC 8446
+    42: EarlyData, # RFC 8446
     43: SupportedVersions, # RFC 8446
 #>    44: Cookie, # RFC 8446
     45: PskKeyExchangeModes, # RFC 8446
@@ -4,6 +4,7 @@ from .handshake.certificate import Certificate
 from .handshake.certificateverify import CertificateVerify
 from .handshake.clienthello import ClientHello
 from .handshake.encryptedextensions import EncryptedExtensions
+from .handshake.endofearlydata import EndOfEarlyData
 from .handshake.finished import Finished
 from .handshake.newsessionticket import NewSessionTicket
 from .handshake.serverhello import ServerHello
@@ -14,7 +15,7 @@ _HANDSHAKE_HANDLERS = {
     1: ClientHello,
     2: ServerHello,
     4: NewSessionTicket,
-#>    5: EndOfEarlyData,
+    5: EndOfEarlyData,
     8: EncryptedExtensions,
     11: Certificate,
 #>    13: CertificateRequest,
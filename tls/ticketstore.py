@@ -0,0 +1,287 @@
+#!/usr/bin/python3
+# RFC8446 4.6.1 (New Session Ticket Message), 4.2.11 (Pre-Shared Key)
+
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+try:
+    import fcntl
+except ImportError: # not POSIX: no locking between processes
+    fcntl = None
+
+# Maximum ticket lifetime allowed by RFC8446 (7 days)
+MAX_TICKET_LIFETIME = 604800
+
+class ResumptionTicket(NamedTuple):
+    """Session ticket with everything needed to resume the session
+
+    Parameters
+    ----------
+    ticket : bytes
+        Opaque ticket (the PSK identity)
+    psk : bytes
+        Pre-shared key derived from the resumption master secret and the
+        ticket nonce
+    cipher_suite : int
+        Cipher suite of the original connection (the PSK is bound to its hash)
+    lifetime : int
+        Ticket lifetime in seconds
+    age_add : int
+        Value to obfuscate the ticket age with
+    received : float
+        Time of receiving the ticket (`time.time()`)
+    max_early_data : int, default=0
+        Maximum size of 0-RTT data accepted with the ticket
+    """
+    ticket: bytes
+    psk: bytes
+    cipher_suite: int
+    lifetime: int
+    age_add: int
+    received: float
+    max_early_data: int = 0
+
+    def age(self, now: float|None = None) -> float:
+        """Age of the ticket in seconds"""
+        return (time.time() if now is None else now) - self.received
+
+    def expired(self, now: float|None = None) -> bool:
+        return self.age(now) >= min(self.lifetime, MAX_TICKET_LIFETIME)
+
+    def obfuscated_age(self, now: float|None = None) -> int:
+        """Ticket age in ms added to `age_add` modulo 2^32"""
+        return int(self.age(now) * 1000) + self.age_add & 0xffffffff
+
+    def dump(self) -> dict:
+        return {
+            'ticket': self.ticket.hex(), 'psk': self.psk.hex(),
+            'cipher_suite': self.cipher_suite, 'lifetime': self.lifetime,
+            'age_add': self.age_add, 'received': self.received,
+            'max_early_data': self.max_early_data,
+            }
+
+    @classmethod
+    def load(cls, data: dict) -> 'ResumptionTicket':
+        return cls(bytes.fromhex(data['ticket']), bytes.fromhex(data['psk']),
+            data['cipher_suite'], data['lifetime'], data['age_add'],
+            data['received'], data['max_early_data'])
+
+
+class TicketStore(ABC):
+    """Session tickets of the servers, keyed by "host:port"
+
+    Tickets are used only once (RFC8446 C.4), the newest one first. Expired
+    tickets are dropped when looked up. A store may be shared by several
+    clients (and threads).
+    """
+    @abstractmethod
+    def add(self, key: str, ticket: ResumptionTicket) -> None:
+        pass
+
+    @abstractmethod
+    def take(self, key: str, now: float|None = None) -> ResumptionTicket|None:
+        """Remove and return the newest valid ticket of a server (if any)"""
+        pass
+
+    @abstractmethod
+    def sweep(self, now: float|None = None) -> None:
+        """Remove all expired tickets"""
+        pass
+
+
+class MemoryTicketStore(TicketStore):
+    """Session tickets kept in memory, for the lifetime of the process
+
+    Parameters
+    ----------
+    max_per_host : int, default=4
+        Number of tickets kept per server, the oldest ones are dropped
+    max_hosts : int, default=256
+        Number of servers kept, the least recently used one is dropped
+    """
+    def __init__(self, *, max_per_host: int = 4, max_hosts: int = 256):
+        self.max_per_host = max_per_host
+        self.max_hosts = max_hosts
+        self._tickets: collections.OrderedDict[str, list[ResumptionTicket]] \
+            = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: str, ticket: ResumptionTicket) -> None:
+        if ticket.lifetime == 0:
+            return # server does not want it to be used
+        with self._lock:
+            tickets = self._tickets.setdefault(key, [])
+            self._tickets.move_to_end(key)
+            tickets.append(ticket)
+            del tickets[:-self.max_per_host]
+            while len(self._tickets) > self.max_hosts:
+                self._tickets.popitem(last=False)
+
+    def take(self, key: str, now: float|None = None) -> ResumptionTicket|None:
+        with self._lock:
+            tickets = self._tickets.get(key)
+            while tickets:
+                ticket = tickets.pop()
+                if not ticket.expired(now):
+                    self._tickets.move_to_end(key)
+                    return ticket
+            self._tickets.pop(key, None)
+        return None
+
+    def sweep(self, now: float|None = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            for key, tickets in list(self._tickets.items()):
+                tickets[:] = [t for t in tickets if not t.expired(now)]
+                if not tickets:
+                    del self._tickets[key]
+
+    def __len__(self) -> int:
+        return sum(len(tickets) for tickets in self._tickets.values())
+
+
+class FileTicketStore(TicketStore):
+    """Session tickets kept in a directory, shared by processes
+
+    Every server has its own JSON file in the directory. The files are
+    changed under an exclusive lock (`flock` of the ".lock" file of the
+    directory), so a ticket is taken by a single process only, and they are
+    replaced atomically (written to a temporary file and renamed), so a
+    crashing process never leaves a partial file behind. If the file cannot
+    be rewritten after taking a ticket (e.g. disk full), it is removed with
+    all its tickets, rather than leaving the taken one to be used again.
+
+    Expired tickets are dropped whenever the file of a server is rewritten.
+    `sweep` cleans the whole directory; `add` calls it at most once per
+    `sweep_interval` seconds.
+
+    Note, that the files contain the resumption PSKs, i.e. secrets: whoever
+    can read them can impersonate the server of a resumed session and decrypt
+    its 0-RTT data. The directory and the files are created accessible only
+    by the owner; the directory must not be shared with other users.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the ticket files (created with mode 0700 if missing)
+    max_per_host : int, default=4
+        Number of tickets kept per server, the oldest ones are dropped
+    sweep_interval : float, default=3600.0
+        Seconds between automatic sweeps of the directory
+    """
+    def __init__(self, path: str, *, max_per_host: int = 4,
+            sweep_interval: float = 3600.0):
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        self.path = path
+        self.max_per_host = max_per_host
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, key: str, ticket: ResumptionTicket) -> None:
+        if ticket.lifetime == 0:
+            return # server does not want it to be used
+        now = time.time()
+        with self._locked():
+            path = self._file(key)
+            tickets = self._read(path, now)
+            tickets.append(ticket)
+            with contextlib.suppress(OSError): # the ticket is just not kept
+                self._write(path, tickets[-self.max_per_host:])
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+    def take(self, key: str, now: float|None = None) -> ResumptionTicket|None:
+        with self._locked():
+            path = self._file(key)
+            if not os.path.exists(path):
+                return None
+            tickets = self._read(path, now)
+            ticket = tickets.pop() if tickets else None
+            try:
+                self._write(path, tickets)
+            except OSError:
+                # The ticket must not stay in the file: another process would
+                # use it again. Drop the other tickets as well, or if even
+                # that fails, do not use the ticket here.
+                try:
+                    os.remove(path)
+                except OSError:
+                    return None
+        return ticket
+
+    def sweep(self, now: float|None = None) -> None:
+        now = time.time() if now is None else now
+        self._last_sweep = now
+        with self._locked():
+            for name in os.listdir(self.path):
+                if name.endswith('.json'):
+                    path = os.path.join(self.path, name)
+                    with contextlib.suppress(OSError):
+                        self._write(path, self._read(path, now))
+
+    def __len__(self) -> int:
+        count = 0
+        with self._locked():
+            for name in os.listdir(self.path):
+                if name.endswith('.json'):
+                    count += len(self._read(os.path.join(self.path, name), None))
+        return count
+
+    @contextlib.contextmanager
+    def _locked(self):
+        # the thread lock is needed, where `flock` is not available
+        fd = os.open(os.path.join(self.path, '.lock'),
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        with self._lock, os.fdopen(fd, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX) # released by closing the file
+            yield
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, urllib.parse.quote(key, safe='') + '.json')
+
+    def _read(self, path: str, now: float|None) -> list[ResumptionTicket]:
+        # valid tickets of a file; an unreadable file is considered empty
+        try:
+            with open(path) as f:
+                tickets = [ResumptionTicket.load(t) for t in json.load(f)]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+        return [t for t in tickets if not t.expired(now)]
+
+    def _write(self, path: str, tickets: list[ResumptionTicket]) -> None:
+        # raises OSError, if the file could not be replaced
+        if not tickets:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        tmp = f'{path}.{os.getpid()}.tmp'
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump([t.dump() for t in tickets], f)
+            os.replace(tmp, path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+
+
+_default_store: TicketStore = MemoryTicketStore()
+
+def default_ticket_store() -> TicketStore:
+    """Ticket store shared by the clients of the process"""
+    return _default_store
+
+def set_default_ticket_store(store: TicketStore) -> None:
+    """Replace the shared ticket store (e.g. with a `FileTicketStore`)"""
+    global _default_store
+    _default_store = store
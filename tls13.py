@@ -10,6 +10,7 @@ from pprint import pprint
 from tls.handshake.certificate import CertificateEntry
 
 from tls import Client
+from tls.ticketstore import FileTicketStore, set_default_ticket_store
 from util.asn1 import *
 from util.pem import Pem
 from crypto.rsa import *
@@ -72,6 +73,8 @@ class Tool:
         self.client = Client(
             hostname = self.hostname,
             port = self.port,
+            # the server sends no certificates in a resumed session
+            resumption = not (args.verify_certificates or args.show_certificates),
 #>            key_share_group = KEY_SHARE_GROUP,
         )
         try:
@@ -134,6 +137,7 @@ class Tool:
         print('Checking certificate chain & signatures')
         # TODO: check order
         ok = True
+        rsa_checks = []
         for issci in cert_info[1:]:
             if issci['subject'] != subci['issuer']:
                 ok = False
@@ -141,14 +145,14 @@ class Tool:
             pubktype = issci['pubkey_type']
             calchash = self.digest(subci['tbsc'], 'sha256')
             if pubktype == 'rsaEncryption':
-                d = self.decrypt_signature(subci['signature'], issci['pubkey'])
-                decrhash = self.decode(d)
-                if calchash != decrhash:
-                    ok = False
-                    print('    Signature error')
+                rsa_checks.append((subci['signature'], issci['rsa_key'], calchash))
             elif pubktype == 'ecPublicKey':
                 print(issci['pubkey']['x'].bit_length())
             subci = issci
+        # all RSA signatures of the chain at once
+        if not all(verify_pkcs1_v15_batch(rsa_checks)):
+            ok = False
+            print('    Signature error')
         if ok:
             print('    OK')
         print('Verifying server information')
@@ -187,7 +191,7 @@ class Tool:
         print('mHash', len(mHash), mHash.hex())
         # 3. EMSA-PSS verification
 #>        print(len(signature), signature.hex())
-        EM = self.decrypt_signature(signature, cert_info[0]['pubkey'])
+        EM = self.decrypt_signature(signature, cert_info[0]['rsa_key'])
 #>        print(len(d), d.hex())
 #>        print(256, cert_info[0]['pubkey']['n'].to_bytes(256).hex())
 #>        print(d)
@@ -264,6 +268,9 @@ class Tool:
                 pubkey['size'] = 384
             else:
                 pubkey['size'] = 521
+        rsa_key = None
+        if 'n' in pubkey: # parsed once, used for all signature checks
+            rsa_key = RsaKey(pubkey['size'], pubkey['n'], pubkey['e'])
         c = Asn1.from_ber(ce.cert_data)
         c.process_encapsulated(selector=[0,6,1])
         t = c[0]
@@ -272,6 +279,7 @@ class Tool:
             'info': info,
             'pubkey_type': info['subjectPublicKeyInfo']['algorithm']['algorithm'],
             'pubkey': pubkey,
+            'rsa_key': rsa_key,
             'tbsc': t._ber,
             'issuer': self.extractInfo(t[3]),
             'subject': self.extractInfo(t[5]),
@@ -295,15 +303,11 @@ class Tool:
     def digest(self, m, alg):
         return hashlib.sha256(m).digest()
 
-    def decrypt_signature(self, ed, pubkey):
+    def decrypt_signature(self, ed, key: RsaKey):
         rsa = Rsa()
-        d = rsa._decrypt(RsaKey(pubkey['size'], pubkey['n'], pubkey['e']), ed)
+        d = rsa._decrypt(key, ed)
         return d
 
-    def decode(self, d):
-        obj = Asn1.from_ber(d)
-        return obj[1].data
-
 def simplify(obj):
     if isinstance(obj, (int, bool, str, type(None))):
         return obj
@@ -358,6 +362,13 @@ def get_args():
     parser.add_argument('--cert-dir', metavar='DIR', default='/usr/lib/ssl/certs', help="""
         Directory containing certificate pem files. (Default: "%(default)s")
     """)
+    parser.add_argument('--ticket-dir', metavar='DIR', help="""
+        Directory of session tickets shared by the runs of this tool (and other
+        processes); a stored ticket resumes the session without a full
+        handshake (not with `-c` or `-v`, which need the certificates of a
+        full handshake). The directory holds secrets (resumption keys), it
+        must be accessible only by the user.
+    """)
     # alternative '/etc/ssl/certs'. '/usr/lib/ssl/certs' is a link to it, but 
     # this contains also links to certs
 
@@ -391,8 +402,11 @@ def fail(errstr: str):
 
 
 def main():
+    if args.ticket_dir:
+        set_default_ticket_store(FileTicketStore(args.ticket_dir))
     tool = Tool()
     tool.run()
 
-get_args()
-main()
+if __name__ == '__main__':
+    get_args()
+    main()
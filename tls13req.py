@@ -4,6 +4,7 @@ import re
 import sys
 
 from tls import Client
+from tls.ticketstore import FileTicketStore, set_default_ticket_store
 
 KEY_SHARE_GROUP = 'x25519' #x448, secp256r1, secp384r1, secp521r1
     # Note: ffdhe2048... does not work, yet
@@ -12,7 +13,7 @@ KEY_SHARE_GROUP = 'x25519' #x448, secp256r1, secp384r1, secp521r1
 def fail(errstr: str|None = None):
     if errstr is not None:
         print(errstr, file=sys.stderr)
-    print(f"Usage: {sys.argv[0]} URL", file=sys.stderr)
+    print(f"Usage: {sys.argv[0]} [--ticket-dir DIR] URL", file=sys.stderr)
     sys.exit(errstr is not None)
 
 def retrieve(url: str):
@@ -56,11 +57,19 @@ def retrieve(url: str):
     return status, header, body
 
 def main():
-    if len(sys.argv) == 1:
-        fail("URL is missing")
-    if sys.argv[1] in ('-h', '--help'):
+    argv = sys.argv[1:]
+    if argv and argv[0] in ('-h', '--help'):
         fail()
-    url = sys.argv[1]
+    if argv and argv[0] == '--ticket-dir':
+        if len(argv) == 1:
+            fail("Ticket directory is missing")
+        # session tickets shared by the runs (e.g. parallel workers); the
+        # directory holds secrets (resumption keys), keep it private
+        set_default_ticket_store(FileTicketStore(argv[1]))
+        argv = argv[2:]
+    if not argv:
+        fail("URL is missing")
+    url = argv[0]
     status, header, body = retrieve(url)
     if status >= 200 and status < 400:
         sys.stdout.buffer.write(body)
@@ -2,6 +2,8 @@
 # Note: for larger random numbers we use pseudo random generator with true
 # random feed
 
+import itertools
+import multiprocessing
 from secrets import randbits, token_bytes
 from random import seed, randint, randrange
 
@@ -30,44 +32,107 @@ def random_int_with_bits(size: int, *, leading_ones: int = 0) -> int:
     high = 1 << size
     return randrange(low, high)
 
-def random_prime_with_bits(size: int, *, leading_ones: int = 1) -> int:
+def random_prime_with_bits(size: int, *, leading_ones: int = 1,
+        processes: int = 0) -> int:
     """Create a random prime with given bit size
 
     For more information, see `random_int_with_bits`.
 
     _Note, that default value of `leading_ones` is 1_
+
+    A random odd starting point is chosen, and a window of the following odd
+    numbers is sieved with small primes at once. Only the survivors are
+    tested with Miller-Rabin, with the number of rounds taken from FIPS 186-4
+    (see `_millerrabin_rounds`).
+
+    Parameters
+    ----------
+    processes : int, default=0
+        If greater than 1, this many processes search in parallel, and the
+        first prime found is returned
+    """
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            return next(pool.imap_unordered(_search_prime,
+                [(size, leading_ones)] * processes))
+    return _search_prime((size, leading_ones))
+
+def random_primes_with_bits(sizes: list[int], *, leading_ones: int = 1,
+        processes: int = 0) -> list[int]:
+    """Create several random primes (e.g. p and q of an RSA key)
+
+    Parameters
+    ----------
+    sizes : list of int
+        Bit size of each prime
+    leading_ones : int, optional, default is 1
+        See `random_int_with_bits`
+    processes : int, default=0
+        If greater than 1, the primes are searched in parallel in this many
+        processes
     """
+    tasks = [(size, leading_ones) for size in sizes]
+    if processes > 1 and len(tasks) > 1:
+        with multiprocessing.Pool(min(processes, len(tasks))) as pool:
+            return pool.map(_search_prime, tasks)
+    return [_search_prime(task) for task in tasks]
+
+# ---- Non-public content ----
+
+def _small_primes(limit: int) -> list[int]:
+    # odd primes below limit (sieve of Eratosthenes)
+    flags = bytearray([1]) * limit
+    flags[0:2] = b'\0\0'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i*i::i] = bytes(len(range(i*i, limit, i)))
+    return [i for i in range(3, limit) if flags[i]]
+
+_SIEVE_PRIMES = _small_primes(1 << 13)
+_SIEVE_WINDOW = 4096 # number of odd candidates sieved at once
+
+def _search_prime(task: tuple[int, int]) -> int:
+    size, leading_ones = task
     # seed is true random. Seed size must be the same size as the result, but it
     # is sufficient to continue with several pseudo-random guesses
     seed(randbits(size))
     # further steps are pseudo random
+    high = 1 << size
+    rounds = _millerrabin_rounds(size)
     while True:
-        prime = _get_prime_candidate(size, leading_ones)
-        if _check_millerrabin(prime):
-            return prime
+        start = random_int_with_bits(size, leading_ones=leading_ones) | 1
+        for candidate in _sieve(start, _SIEVE_WINDOW):
+            if candidate >= high:
+                break
+            if _check_millerrabin(candidate, rounds):
+                return candidate
 
-# ---- Non-public content ----
+def _sieve(start: int, count: int) -> list[int]:
+    # odd numbers start, start+2, ..., start+2(count-1) without small factors
+    flags = bytearray([1]) * count
+    for r in _SIEVE_PRIMES:
+        # first i with start + 2i = 0 (mod r); 1/2 = (r+1)/2 (mod r)
+        i = -start * (r + 1 >> 1) % r
+        if start + 2 * i == r: # small prime itself
+            i += r
+        if i < count:
+            flags[i::r] = bytes(len(range(i, count, r)))
+    return list(itertools.compress(range(start, start + 2 * count, 2), flags))
 
-_PRIME_LIST = [
-    2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71,
-    73, 79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131, 137, 139, 149, 151,
-    157, 163, 167, 173, 179, 181, 191, 193, 197, 199, 211, 223, 227, 229, 233,
-    239, 241, 251, 257, 263, 269, 271, 277, 281, 283, 293, 307, 311, 313, 317,
-    331, 337, 347, 349, 353, 359, 367, 373, 379, 383, 389, 397, 401, 409, 419,
-    421, 431, 433, 439, 443, 449, 457, 461, 463, 467, 479, 487, 491, 499
-    ]
+def _millerrabin_rounds(size: int) -> int:
+    # FIPS 186-4, Table C.3 (M-R tests only): rounds for random primes p, q
+    # of RSA keys with error probability 2^-100 (512 bits), 2^-112 (1024
+    # bits) and 2^-128 (1536 bits). Smaller sizes are out of the scope of the
+    # table, they keep the conservative 64 rounds.
+    if size >= 1536:
+        return 3
+    if size >= 1024:
+        return 4
+    if size >= 512:
+        return 7
+    return 64
 
-def _get_prime_candidate(size: int, leading_ones: int) -> int:
-    while True:
-        prime = random_int_with_bits(size, leading_ones=leading_ones)
-        for div in _PRIME_LIST:
-            if prime % div == 0:
-                break
-        else:
-            return prime
-
-def _check_millerrabin(n: int) -> bool:
-    k = 64
+def _check_millerrabin(n: int, k: int = 64) -> bool:
     d = n - 1
     s = 0
     while (d & 1) == 0:
@@ -77,12 +142,14 @@ def _check_millerrabin(n: int) -> bool:
     for _ in range(k):
         a = randint(2, n - 2)
         x = pow(a, d, n)
-        for __ in range(s):
-            y = pow(x, 2, n)
-            if y == 1 and x != 1 and x != n - 1:
-                # nontrivial square root of 1 modulo n
-                return False
-            x = y
-        if y != 1:
+        if x == 1 or x == n - 1:
+            continue
+        for __ in range(s - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            # no -1 in the sequence: either a^(n-1) != 1, or there is a
+            # nontrivial square root of 1 modulo n
             return False
     return True